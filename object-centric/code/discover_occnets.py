@@ -1,9 +1,19 @@
 import warnings
 import pathlib
-from collections import Counter, namedtuple
+import hashlib
+import os
+import pickle
+import time
+import json
+import sqlite3
+from array import array
+from xml.etree import ElementTree
+from collections import Counter, OrderedDict, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
 import csv
 from io import StringIO
-from itertools import combinations
+from itertools import chain, combinations
 
 import pandas as pd
 import numpy as np
@@ -14,12 +24,27 @@ from pm4py.statistics.ocel import ot_activities as ot
 warnings.filterwarnings('ignore')
 
 
+TraceStore = namedtuple("TraceStore", ["activities", "vocabulary", "cases", "codes", "offsets", "weights"], defaults=(None,))
+OccurrenceIndex = namedtuple("OccurrenceIndex", ["offsets", "codes", "first", "last"])
+ReachabilityIndex = namedtuple("ReachabilityIndex", ["activities", "vocabulary", "target_position", "avoid"])
+LongDistanceCounts = namedtuple("LongDistanceCounts", ["activities", "vocabulary", "totals", "between", "reachability"])
+TraceStatistics = namedtuple("TraceStatistics", ["act_total", "start_activities", "end_activities", "original_start", "original_end"])
+StringVocabulary = namedtuple("StringVocabulary", ["data", "offsets"])
+LogSnapshot = namedtuple("LogSnapshot", ["events", "objects", "activities", "types", "event_activity", "event_time", "object_type", "offsets", "relations"])
+SharedStore = namedtuple("SharedStore", ["codes", "offsets", "weights", "n_events", "n_cases"])
+OTArtefacts = namedtuple("OTArtefacts", ["statistics", "frequencies", "activities", "dependencies", "dep_dict", "long_distance"])
+OTDiscovery = namedtuple("OTDiscovery", ["act_total", "activities", "dep_dict", "depgraph", "cnet_inbindings", "cnet_outbindings"])
 
-def import_log(ocel_path):
+
+def import_log(ocel_path, snapshot=None):
     
     file_extension = pathlib.Path(ocel_path).suffix
     
-    if file_extension == '.sqlite':
+    if pathlib.Path(ocel_path).is_dir():
+        log_snapshot = read_snapshot(ocel_path)
+        event_to_obj = snapshot_relations(log_snapshot)
+        return None, type_activity_sets(zip(event_to_obj['ocel:activity'], event_to_obj['ocel:type'])), event_to_obj, None
+    elif file_extension == '.sqlite':
         ocel = pm4py.read_ocel2_sqlite(ocel_path)
     elif file_extension == '.json':
         ocel = pm4py.read_ocel2_json(ocel_path)
@@ -39,6 +64,9 @@ def import_log(ocel_path):
         obj_to_obj = ocel.o2o
         event_to_obj = ocel.relations
 
+        if snapshot is not None:
+            write_snapshot(flattening_order(ocel), snapshot, log_fingerprint(ocel_path))
+
         return ocel, ot_activities, event_to_obj, obj_to_obj
 
     
@@ -51,55 +79,266 @@ def import_log(ocel_path):
     
 
 
+class JsonScanner:
+
+    def __init__(self, json_file, chunk_size):
+        self.json_file = json_file
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ''
+        self.position = 0
+        self.eof = False
+
+    def fill(self):
+        chunk = self.json_file.read(self.chunk_size)
+        self.buffer = self.buffer[self.position:] + chunk
+        self.position = 0
+        self.eof = chunk == ''
+
+    def peek(self):
+        while True:
+            while self.position < len(self.buffer) and self.buffer[self.position] in ' \t\r\n':
+                self.position += 1
+            if self.position < len(self.buffer) or self.eof:
+                return self.buffer[self.position:self.position+1]
+            self.fill()
+
+    def take(self):
+        char = self.peek()
+        if char == '':
+            raise Exception("Unexpected end of the JSON log.")
+        self.position += 1
+        return char
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.position)
+                if self.eof or (end < len(self.buffer) and self.buffer[end] not in '0123456789.eE+-'):
+                    self.position = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self.fill()
+
+
+
+def json_items(path, chunk_size=2**20):
+
+    with open(path, 'r', encoding='utf-8') as json_file:
+        scanner = JsonScanner(json_file, chunk_size)
+
+        if scanner.take() != '{':
+            raise Exception("The JSON log must contain an object at the top level.")
+
+        while scanner.peek() != '}':
+            key = scanner.value()
+            scanner.take()
+
+            if scanner.peek() == '[':
+                scanner.take()
+                while scanner.peek() != ']':
+                    yield key, scanner.value()
+                    if scanner.peek() == ',':
+                        scanner.take()
+                scanner.take()
+            else:
+                yield key, scanner.value()
+
+            if scanner.peek() == ',':
+                scanner.take()
+
+
+
+def ocel_json_records(path):
+
+    for key, item in json_items(path):
+        if key == 'objects':
+            yield 'objects', (item['id'], item['type'])
+        elif key == 'events':
+            yield 'events', (item['id'], item['type'], item['time'], list(dict.fromkeys(relation['objectId'] for relation in item.get('relationships', []))))
+
+
+
+def ocel_xml_records(path):
+
+    depth = 0
+    section = None
+
+    for action, element in ElementTree.iterparse(path, events=('start', 'end')):
+        if action == 'start':
+            depth += 1
+            if depth == 2 and element.tag in ['objects', 'events']:
+                section = element
+            continue
+
+        depth -= 1
+
+        if depth == 2 and element.tag == 'object':
+            yield 'objects', (element.get('id'), element.get('type'))
+            section.clear()
+        elif depth == 2 and element.tag == 'event':
+            yield 'events', (element.get('id'), element.get('type'), element.get('time'), [relation.get('object-id') for relation in element.iter('relationship')])
+            section.clear()
+
+
+
+def stream_ocel(path):
+
+    file_extension = pathlib.Path(path).suffix
+
+    if file_extension == '.json':
+        read_records = ocel_json_records
+    elif file_extension == '.xml':
+        read_records = ocel_xml_records
+    else:
+        raise Exception("The file formats supported for streaming are json and xml.")
+
+    object_types = {}
+    object_rank = {}
+    deferred = False
+
+    def related(objects):
+        return [(oid, object_types[oid]) for oid in sorted((oid for oid in objects if oid in object_types), key=object_rank.get)]
+
+    for section, record in read_records(path):
+        if section == 'objects':
+            object_types[record[0]] = record[1]
+            object_rank.setdefault(record[0], len(object_rank))
+        elif deferred or not object_types:
+            deferred = True
+        else:
+            eid, activity, timestamp, objects = record
+            yield eid, activity, timestamp, related(objects)
+
+    if deferred:
+        for section, record in read_records(path):
+            if section == 'events':
+                eid, activity, timestamp, objects = record
+                yield eid, activity, timestamp, related(objects)
+
+
+
 def ot_act_stats(event_to_obj):
-    
-    unique_activities = event_to_obj[['ocel:eid', 'ocel:activity']].drop_duplicates()
-    total_act = unique_activities['ocel:activity'].value_counts().to_dict()
 
+    total_act, table = ot_act_table(event_to_obj)
 
-    
-    ot_counts = (
-        event_to_obj.groupby(['ocel:activity', 'ocel:type'])
-        .size()
-        .unstack(fill_value=0)
-        .to_dict(orient='index')
-    )
+    return act_stats_dicts(total_act, table)
 
-    obj_mean = {
-        activity: {obj_type: np.round(np.mean(count / total_act[activity]),2)
-                for obj_type,count in counts.items()}
-        for activity,counts in ot_counts.items()
-    }
 
-    
-    obj_counts = event_to_obj.groupby(["ocel:activity", "ocel:eid", "ocel:type"]).size().reset_index(name="count")
 
-    
-    obj_aggregated = obj_counts.groupby(["ocel:activity", "ocel:type"])["count"].agg(["median", "min", "max"]).reset_index()
+def ot_act_table(event_to_obj):
 
-   
-    obj_median = (
-        obj_aggregated.groupby("ocel:activity")
-        .apply(lambda x: dict(zip(x["ocel:type"], np.round(x["median"]).astype(int))))
-        .to_dict()
-    )
+    event_codes, _ = pd.factorize(event_to_obj['ocel:eid'])
+    activity = pd.Categorical(event_to_obj['ocel:activity'])
+    obj_type = pd.Categorical(event_to_obj['ocel:type'])
 
-    obj_min = (
-        obj_aggregated.groupby("ocel:activity")
-        .apply(lambda x: dict(zip(x["ocel:type"], x["min"])))
-        .to_dict()
-    )
+    event_types, first, n_objects = np.unique(event_codes.astype(np.int64) * max(len(obj_type.categories), 1) + obj_type.codes, return_index=True, return_counts=True)
+    _, event_first = np.unique(event_codes, return_index=True)
+
+    total_act = pd.Series(np.asarray(event_to_obj['ocel:activity'])[np.sort(event_first)]).value_counts().to_dict()
+
+    return total_act, act_stats_table(activity[first], obj_type[first], n_objects, np.ones(len(first), dtype=np.int64), total_act)
+
+
+
+def act_stats_table(activity, obj_type, n_objects, n_events, total_act):
+
+    activity = pd.Categorical(activity)
+    obj_type = pd.Categorical(obj_type)
+    n_types = max(len(obj_type.categories), 1)
+
+    group = activity.codes.astype(np.int64) * n_types + obj_type.codes
+    n_objects = np.asarray(n_objects, dtype=np.int64)
+    n_events = np.asarray(n_events, dtype=np.int64)
+
+    order = np.lexsort((n_objects, group))
+    group, n_objects, n_events = group[order], n_objects[order], n_events[order]
+
+    starts = np.flatnonzero(np.diff(group, prepend=-1) != 0)
+    ends = np.append(starts[1:], len(group)).astype(np.int64)
+
+    cumulative = np.cumsum(n_events)
+    before = cumulative[starts] - n_events[starts]
+    group_events = cumulative[ends - 1] - before
+    middle = np.searchsorted(cumulative, np.stack([before + (group_events - 1) // 2, before + group_events // 2]), side='right')
+
+    activity_codes = group[starts] // n_types
+    events = np.array([total_act[act] for act in activity.categories[activity_codes]], dtype=np.int64)
+    count = np.add.reduceat(n_objects * n_events, starts) if len(starts) > 0 else np.zeros(0, dtype=np.int64)
+
+    index = pd.MultiIndex.from_arrays([
+        pd.Categorical.from_codes(activity_codes, activity.categories),
+        pd.Categorical.from_codes(group[starts] % n_types, obj_type.categories)
+    ], names=['ocel:activity', 'ocel:type'])
+
+    return pd.DataFrame({
+        'events': events,
+        'count': count,
+        'mean': np.round(count / np.maximum(events, 1), 2),
+        'median': np.round(n_objects[middle].mean(axis=0)).astype(int),
+        'min': n_objects[starts],
+        'max': n_objects[ends - 1]
+    }, index=index)
 
-    obj_max = (
-        obj_aggregated.groupby("ocel:activity")
-        .apply(lambda x: dict(zip(x["ocel:type"], x["max"])))
-        .to_dict()
-    )
+
+
+def act_stats_dicts(total_act, table):
+
+    obj_types = table.index.levels[1].tolist()
+
+    ot_counts = {}
+    obj_mean = {}
+    obj_median = {}
+    obj_min = {}
+    obj_max = {}
+
+    columns = [table[column].to_numpy() for column in ['count', 'mean', 'median', 'min', 'max']]
+
+    for (activity, obj_type), count, mean, median, min_val, max_val in zip(table.index, *columns):
+        if activity not in ot_counts:
+            ot_counts[activity] = {t: 0 for t in obj_types}
+            obj_mean[activity] = {t: np.float64(0.0) for t in obj_types}
+            obj_median[activity] = {}
+            obj_min[activity] = {}
+            obj_max[activity] = {}
+
+        ot_counts[activity][obj_type] = count.item()
+        obj_mean[activity][obj_type] = mean
+        obj_median[activity][obj_type] = median
+        obj_min[activity][obj_type] = min_val
+        obj_max[activity][obj_type] = max_val
 
     return total_act, ot_counts, obj_mean, obj_median, obj_min, obj_max
 
 
 
+def relation_histogram(event_to_obj):
+
+    unique_activities = event_to_obj[['ocel:eid', 'ocel:activity']].drop_duplicates()
+    total_act = Counter(unique_activities['ocel:activity'].value_counts().to_dict())
+
+    obj_counts = event_to_obj.groupby(['ocel:activity', 'ocel:eid', 'ocel:type']).size()
+    histogram = obj_counts.groupby(level=['ocel:activity', 'ocel:type']).value_counts()
+
+    return total_act, Counter({key: count for key, count in histogram.items()})
+
+
+
+def histogram_act_stats(total_act, histogram):
+
+    keys = list(histogram)
+    activity = pd.Categorical([key[0] for key in keys])
+    obj_type = pd.Categorical([key[1] for key in keys])
+    n_objects = [key[2] for key in keys]
+
+    table = act_stats_table(activity, obj_type, n_objects, list(histogram.values()), total_act)
+
+    return act_stats_dicts(dict(total_act.most_common()), table)
+
+
 
 def flatten_log(ocel, ot_activities):
 
@@ -115,64 +354,540 @@ def flatten_log(ocel, ot_activities):
 
 
 
-def read_log(flattened_logs):
+def flattening_order(ocel):
+
+    event_position = pd.Series(np.arange(len(ocel.events)), index=ocel.events['ocel:eid'])
+    object_position = pd.Series(np.arange(len(ocel.objects)), index=ocel.objects['ocel:oid'])
+
+    relations = ocel.relations
+    order = np.lexsort((relations['ocel:oid'].map(object_position).to_numpy(), relations['ocel:eid'].map(event_position).to_numpy()))
+
+    return relations.iloc[order]
+
+
+
+def flatten_relations(event_to_obj, ot_activities):
+
+    flattened_columns = {
+        'ocel:oid': 'case:concept:name',
+        'ocel:activity': 'concept:name',
+        'ocel:timestamp': 'time:timestamp'
+    }
+
+    relations = event_to_obj[event_to_obj['ocel:type'].isin(list(ot_activities.keys()))]
+    relations = relations.rename(columns=flattened_columns)[['case:concept:name', 'concept:name', 'ocel:eid', 'time:timestamp', 'ocel:type']]
+
+    ot_relations = dict(tuple(relations.groupby('ocel:type', sort=False)))
+
+    flattened_logs = {o_type: ot_relations[o_type] for o_type in ot_activities.keys() if o_type in ot_relations}
+
+    return flattened_logs
+
+
+
+def frame_cases(flt):
+
+    case_codes, case_ids = pd.factorize(flt['case:concept:name'])
+    order = flt['time:timestamp'].argsort(kind='stable').to_numpy()
+    order = order[np.argsort(case_codes[order], kind='stable')]
+    case_codes = case_codes[order]
+
+    tasks = flt['concept:name'].to_numpy()[order].tolist()
+    eids = flt['ocel:eid'].to_numpy()[order].tolist()
+    timestamps = flt['time:timestamp'].iloc[order].tolist()
+
+    bounds = np.flatnonzero(case_codes[1:] != case_codes[:-1]) + 1
+    starts = [0] + bounds.tolist()
+    ends = bounds.tolist() + [len(case_codes)]
+
+    if len(case_codes) == 0:
+        return [], [], [], []
+
+    cases = case_ids[case_codes[starts]].tolist()
+    events = list(zip(tasks, eids, timestamps))
+
+    return cases, starts, ends, events
+
+
+
+def frame_store(flt):
+
+    case_codes, case_ids = pd.factorize(flt['case:concept:name'])
+    order = flt['time:timestamp'].argsort(kind='stable').to_numpy()
+    order = order[np.argsort(case_codes[order], kind='stable')]
+    case_codes = case_codes[order]
+
+    codes, activities = pd.factorize(flt['concept:name'].to_numpy()[order])
+    activities = activities.tolist()
+
+    bounds = np.flatnonzero(case_codes[1:] != case_codes[:-1]) + 1
+    offsets = np.concatenate(([0], bounds, [len(case_codes)])).astype(np.int64)
+    cases = case_ids[case_codes[offsets[:-1]]].tolist() if len(case_codes) > 0 else []
+    offsets = offsets if len(case_codes) > 0 else np.zeros(1, dtype=np.int64)
+
+    vocabulary = {activity: code for code, activity in enumerate(activities)}
+
+    return TraceStore(activities, vocabulary, cases, codes.astype(np.int32), offsets)
+
+
+
+def csv_cases(fltlog):
+
+    csv_io = StringIO(fltlog)
+    reader = csv.DictReader(csv_io)
+
+    case_col = next((col for col in reader.fieldnames if col.lower() == 'case:concept:name'), None)
+    task_col = next((col for col in reader.fieldnames if col.lower() == 'concept:name'), None)
+    eid_col = next((col for col in reader.fieldnames if col.lower() == 'ocel:eid'), None)
+    time_col = next((col for col in reader.fieldnames if col.lower() == 'time:timestamp'), None)
+
+    case_events = {}
+
+    for row in reader:
+        caseID = row.get(case_col)
+        event = (row.get(task_col), row.get(eid_col), row.get(time_col))
+        if caseID not in case_events:
+            case_events[caseID] = []
+        case_events[caseID].append(event)
+
+    cases = []
+    starts = []
+    ends = []
+    events = []
+
+    for caseID, case in case_events.items():
+        case.sort(key = lambda event: event[-1])
+        cases.append(caseID)
+        starts.append(len(events))
+        events.extend(case)
+        ends.append(len(events))
+
+    return cases, starts, ends, events
+
+
+
+def build_traces(flattened_logs):
 
     logs = dict()
+    all_traces = dict()
 
     for o_type, fltlog in flattened_logs.items():
-        if o_type not in logs.keys():
-            logs[o_type] = {}
-        csv_io = StringIO(fltlog)
-        reader = csv.DictReader(csv_io)
-        for row in reader:
-            case_col = next((col for col in reader.fieldnames if col.lower() == 'case:concept:name'), None)
-            task_col = next((col for col in reader.fieldnames if col.lower() == 'concept:name'), None)
-            eid_col = next((col for col in reader.fieldnames if col.lower() == 'ocel:eid'), None)
-            time_col = next((col for col in reader.fieldnames if col.lower() == 'time:timestamp'), None)
-
-            caseID = row.get(case_col)
-            task = row.get(task_col)
-            eid = row.get(eid_col)
-            timestamp = row.get(time_col)
-
-            if caseID not in logs[o_type]:
-                logs[o_type][caseID] = []
-            event = (task, eid, timestamp)
-            logs[o_type][caseID].append(event)
-
-        for caseID in sorted(logs[o_type].keys()):
-            logs[o_type][caseID].sort(key = lambda event: event[-1])
+        if isinstance(fltlog, pd.DataFrame):
+            cases, starts, ends, events = frame_cases(fltlog)
+        else:
+            cases, starts, ends, events = csv_cases(fltlog)
+
+        tasks = [event[0] for event in events]
+
+        logs[o_type] = {caseID: events[start:end] for caseID, start, end in zip(cases, starts, ends)}
+        all_traces[o_type] = {caseID: tasks[start:end] for caseID, start, end in zip(cases, starts, ends)}
+
+    return logs, all_traces
+
+
+
+def trace_store(ot_traces):
+
+    lengths = [len(trace) for trace in ot_traces.values()]
+    tasks = np.array(list(chain.from_iterable(ot_traces.values())), dtype=object)
+
+    codes, activities = pd.factorize(tasks)
+    activities = activities.tolist()
+
+    offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+
+    vocabulary = {activity: code for code, activity in enumerate(activities)}
+
+    return TraceStore(activities, vocabulary, list(ot_traces.keys()), codes.astype(np.int32), offsets)
+
+
+
+def trace_stores(flattened_logs):
+
+    stores = {}
+
+    for o_type, fltlog in flattened_logs.items():
+        if isinstance(fltlog, pd.DataFrame):
+            stores[o_type] = frame_store(fltlog)
+        else:
+            cases, starts, ends, events = csv_cases(fltlog)
+            tasks = [event[0] for event in events]
+            stores[o_type] = trace_store({caseID: tasks[start:end] for caseID, start, end in zip(cases, starts, ends)})
+
+    return stores
+
+
+
+def stream_traces(events):
+
+    total_act = Counter()
+    histogram = Counter()
+    type_activities = set()
+    relations = {}
+
+    for eid, activity, timestamp, objects in events:
+        if not objects:
+            continue
+
+        time_ns = pd.Timestamp(timestamp).value
+        total_act[activity] += 1
+
+        for obj_type, n_objects in Counter(obj_type for _, obj_type in objects).items():
+            histogram[(activity, obj_type, n_objects)] += 1
+            type_activities.add((activity, obj_type))
+
+        for oid, obj_type in objects:
+            if obj_type not in relations:
+                relations[obj_type] = ({}, {}, array('q'), array('q'), array('q'))
+            case_codes, activity_codes, cases, tasks, times = relations[obj_type]
+            cases.append(case_codes.setdefault(oid, len(case_codes)))
+            tasks.append(activity_codes.setdefault(activity, len(activity_codes)))
+            times.append(time_ns)
+
+    ot_activities = type_activity_sets(type_activities)
+    stores = {obj_type: relation_store(*relations.pop(obj_type)) for obj_type in ot_activities}
+
+    return ot_activities, stores, histogram_act_stats(total_act, histogram)
+
+
+
+def type_activity_sets(type_activities):
+
+    ot_activities = {}
+
+    for activity, obj_type in sorted(type_activities):
+        ot_activities.setdefault(obj_type, set()).add(activity)
+
+    return ot_activities
+
+
+
+def relation_store(case_codes, activity_codes, cases, tasks, times):
+
+    order = np.argsort(np.asarray(times), kind='stable')
+
+    flt = pd.DataFrame({
+        'case:concept:name': np.array(list(case_codes), dtype=object)[np.asarray(cases, dtype=np.int64)[order]],
+        'concept:name': np.array(list(activity_codes), dtype=object)[np.asarray(tasks, dtype=np.int64)[order]],
+        'time:timestamp': np.asarray(times)[order]
+    })
+
+    return frame_store(flt)
+
+
+
+def sqlite_event_times(connection):
+
+    event_tables = connection.execute('SELECT ocel_type, ocel_type_map FROM event_map_type').fetchall()
+
+    return ' UNION ALL '.join(
+        'SELECT ocel_id, ocel_time FROM "%s"' % ('event_' + type_map).replace('"', '""')
+        for _, type_map in event_tables
+    )
+
+
+
+def sqlite_traces(path):
+
+    connection = sqlite3.connect(pathlib.Path(path).resolve().as_uri() + '?mode=ro', uri=True)
+
+    try:
+        relations = """
+            WITH event_time AS ({event_times}),
+            relations AS (
+                SELECT o.ocel_type AS obj_type, eo.ocel_object_id AS oid, e.ocel_type AS activity, eo.ocel_event_id AS eid, julianday(et.ocel_time) AS time, e.rowid AS event_rank, o.rowid AS object_rank
+                FROM event_object eo
+                JOIN event e ON e.ocel_id = eo.ocel_event_id
+                JOIN event_time et ON et.ocel_id = eo.ocel_event_id
+                JOIN object o ON o.ocel_id = eo.ocel_object_id
+            )
+        """.format(event_times=sqlite_event_times(connection))
+
+        total_act = Counter(dict(connection.execute(relations + """
+            SELECT activity, COUNT(DISTINCT eid) FROM relations
+            GROUP BY activity
+        """)))
+
+        histogram = Counter({(activity, obj_type, n_objects): n_events for activity, obj_type, n_objects, n_events in connection.execute(relations + """
+            SELECT activity, obj_type, n_objects, COUNT(*) FROM (
+                SELECT activity, obj_type, COUNT(*) AS n_objects FROM relations
+                GROUP BY eid, activity, obj_type
+            )
+            GROUP BY activity, obj_type, n_objects
+        """)})
+
+        ot_activities = type_activity_sets((activity, obj_type) for activity, obj_type, _ in histogram)
+
+        stores = {}
+        current_type = None
+
+        cursor = connection.execute(relations + """
+            SELECT obj_type, oid, activity, time FROM relations
+            ORDER BY obj_type, time, event_rank, object_rank
+        """)
+
+        for obj_type, oid, activity, time_key in cursor:
+            if obj_type != current_type:
+                if current_type is not None:
+                    stores[current_type] = relation_store(*type_relations)
+                current_type = obj_type
+                type_relations = ({}, {}, array('q'), array('q'), array('d'))
+            case_codes, activity_codes, cases, tasks, times = type_relations
+            cases.append(case_codes.setdefault(oid, len(case_codes)))
+            tasks.append(activity_codes.setdefault(activity, len(activity_codes)))
+            times.append(time_key)
+
+        if current_type is not None:
+            stores[current_type] = relation_store(*type_relations)
+
+    finally:
+        connection.close()
+
+    return ot_activities, {obj_type: stores[obj_type] for obj_type in ot_activities}, histogram_act_stats(total_act, histogram)
+
+
+
+def write_vocabulary(directory, name, values):
+
+    encoded = [str(value).encode('utf-8') for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(value) for value in encoded], out=offsets[1:])
+
+    np.save(directory / (name + '.npy'), np.frombuffer(b''.join(encoded), dtype=np.uint8))
+    np.save(directory / (name + '_offsets.npy'), offsets)
+
+
+
+def read_vocabulary(directory, name):
+
+    return StringVocabulary(np.load(directory / (name + '.npy'), mmap_mode='r'), np.load(directory / (name + '_offsets.npy'), mmap_mode='r'))
+
+
+
+def vocabulary_strings(vocabulary, codes):
+
+    used, inverse = np.unique(codes, return_inverse=True)
+    data = memoryview(np.asarray(vocabulary.data))
+    offsets = np.asarray(vocabulary.offsets)
+
+    strings = np.array([str(data[start:end], 'utf-8') for start, end in zip(offsets[used].tolist(), offsets[used + 1].tolist())], dtype=object)
+
+    return strings[inverse]
+
+
+
+def write_snapshot(event_to_obj, directory, fingerprint=None):
+
+    directory = pathlib.Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    event_codes, events = pd.factorize(event_to_obj['ocel:eid'])
+    object_codes, objects = pd.factorize(event_to_obj['ocel:oid'])
+    activity_codes, activities = pd.factorize(event_to_obj['ocel:activity'])
+    type_codes, types = pd.factorize(event_to_obj['ocel:type'])
+
+    event_activity = np.zeros(len(events), dtype=np.int32)
+    event_activity[event_codes] = activity_codes
+    event_time = np.zeros(len(events), dtype=np.int64)
+    event_time[event_codes] = pd.DatetimeIndex(event_to_obj['ocel:timestamp']).asi8
+    object_type = np.zeros(len(objects), dtype=np.int32)
+    object_type[object_codes] = type_codes
+
+    offsets = np.zeros(len(events) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(event_codes, minlength=len(events)), out=offsets[1:])
+    relations = object_codes[np.argsort(event_codes, kind='stable')].astype(np.int32)
+
+    columns = {'event_activity': event_activity, 'event_time': event_time, 'object_type': object_type, 'offsets': offsets, 'relations': relations}
+    for name, column in columns.items():
+        np.save(directory / (name + '.npy'), column)
+
+    write_vocabulary(directory, 'events', events)
+    write_vocabulary(directory, 'objects', objects)
+
+    if fingerprint is None:
+        files = list(columns) + ['events', 'events_offsets', 'objects', 'objects_offsets']
+        fingerprint = hashlib.sha256(''.join(log_fingerprint(directory / (name + '.npy')) for name in files).encode()).hexdigest()
+
+    vocabularies = {
+        'fingerprint': fingerprint,
+        'activities': activities.tolist(),
+        'types': types.tolist()
+    }
+    with open(directory / 'vocabularies.json', 'w', encoding='utf-8') as vocabulary_file:
+        json.dump(vocabularies, vocabulary_file)
+
+    return read_snapshot(directory)
+
+
+
+def read_snapshot(directory):
+
+    directory = pathlib.Path(directory)
+
+    with open(directory / 'vocabularies.json', 'r', encoding='utf-8') as vocabulary_file:
+        vocabularies = json.load(vocabulary_file)
+
+    columns = {name: np.load(directory / (name + '.npy'), mmap_mode='r') for name in ['event_activity', 'event_time', 'object_type', 'offsets', 'relations']}
+
+    return LogSnapshot(read_vocabulary(directory, 'events'), read_vocabulary(directory, 'objects'), vocabularies['activities'], vocabularies['types'], **columns)
+
+
+
+def snapshot_columns(log_snapshot):
+
+    relation_event = np.repeat(np.arange(len(log_snapshot.offsets) - 1, dtype=np.int64), np.diff(log_snapshot.offsets))
+    relation_object = np.asarray(log_snapshot.relations, dtype=np.int64)
+
+    return relation_event, relation_object, np.asarray(log_snapshot.event_activity)[relation_event], np.asarray(log_snapshot.object_type)[relation_object]
+
+
+
+def snapshot_relations(log_snapshot):
+
+    relation_event, relation_object, relation_activity, relation_type = snapshot_columns(log_snapshot)
+
+    return pd.DataFrame({
+        'ocel:eid': vocabulary_strings(log_snapshot.events, relation_event),
+        'ocel:oid': vocabulary_strings(log_snapshot.objects, relation_object),
+        'ocel:activity': np.array(log_snapshot.activities, dtype=object)[relation_activity],
+        'ocel:timestamp': pd.to_datetime(np.asarray(log_snapshot.event_time)[relation_event], utc=True),
+        'ocel:type': np.array(log_snapshot.types, dtype=object)[relation_type]
+    })
+
+
+
+def snapshot_traces(log_snapshot):
+
+    relation_event, relation_object, relation_activity, relation_type = snapshot_columns(log_snapshot)
+    n_types = len(log_snapshot.types)
+
+    related = np.diff(log_snapshot.offsets) > 0
+    event_counts = np.bincount(np.asarray(log_snapshot.event_activity)[related], minlength=len(log_snapshot.activities))
+    total_act = Counter({log_snapshot.activities[code]: count.item() for code, count in enumerate(event_counts) if count > 0})
+
+    event_types, n_objects = np.unique(relation_event * n_types + relation_type, return_counts=True)
+    event_activity = np.asarray(log_snapshot.event_activity)[event_types // n_types]
+    groups, n_events = np.unique(np.stack([event_activity, event_types % n_types, n_objects]), axis=1, return_counts=True)
+    histogram = Counter({(log_snapshot.activities[activity], log_snapshot.types[obj_type], n.item()): count.item() for (activity, obj_type, n), count in zip(groups.T, n_events)})
+
+    ot_activities = type_activity_sets((activity, obj_type) for activity, obj_type, _ in histogram)
+
+    activities = np.array(log_snapshot.activities, dtype=object)
+    event_time = np.asarray(log_snapshot.event_time)
+    stores = {}
+
+    for obj_type in ot_activities:
+        selected = relation_type == log_snapshot.types.index(obj_type)
+        flt = pd.DataFrame({
+            'case:concept:name': vocabulary_strings(log_snapshot.objects, relation_object[selected]),
+            'concept:name': activities[relation_activity[selected]],
+            'time:timestamp': event_time[relation_event[selected]]
+        })
+        stores[obj_type] = frame_store(flt)
+
+    return ot_activities, stores, histogram_act_stats(total_act, histogram)
+
+
+
+def store_traces(store):
+
+    names = np.array(store.activities, dtype=object)[store.codes].tolist()
+    offsets = store.offsets.tolist()
+
+    return {caseID: names[offsets[i]:offsets[i+1]] for i, caseID in enumerate(store.cases)}
+
+
+
+def case_weights(store):
+
+    if store.weights is None:
+        return np.ones(len(store.cases), dtype=np.int64)
+
+    return np.asarray(store.weights, dtype=np.int64)
+
+
+
+def weighted_bincount(values, weights, minlength):
+
+    if weights is None:
+        return np.bincount(values, minlength=minlength)
+
+    return np.rint(np.bincount(values, weights=weights, minlength=minlength)).astype(np.int64)
+
+
+
+def event_weights(store):
+
+    if store.weights is None:
+        return None
+
+    return np.repeat(case_weights(store), np.diff(store.offsets))
+
+
+
+def weighted_traces(traces):
+
+    if isinstance(traces, TraceStore):
+        return zip(store_traces(traces).values(), case_weights(traces).tolist())
+
+    return ((trace, 1) for trace in traces.values())
+
+
+
+def compress_variants(store):
+
+    weights = case_weights(store).tolist()
+    offsets = store.offsets.tolist()
+    variants = {}
+
+    for i in range(len(store.cases)):
+        variant = store.codes[offsets[i]:offsets[i+1]].tobytes()
+        if variant in variants:
+            variants[variant][1] += weights[i]
+        else:
+            variants[variant] = [i, weights[i]]
+
+    first_cases = [first_case for first_case, _ in variants.values()]
+    lengths = np.diff(store.offsets)[first_cases] if first_cases else np.zeros(0, dtype=np.int64)
+
+    variant_offsets = np.zeros(len(first_cases) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=variant_offsets[1:])
+    codes = np.frombuffer(b''.join(variants), dtype=store.codes.dtype).copy()
+
+    return TraceStore(store.activities, store.vocabulary, [store.cases[i] for i in first_cases], codes, variant_offsets, np.array([weight for _, weight in variants.values()], dtype=np.int64))
+
+
+
+def as_traces(traces):
+
+    if isinstance(traces, TraceStore):
+        return store_traces(traces)
+
+    return traces
+
+
+
+def case_activities(log):
+
+    if isinstance(log, TraceStore):
+        return store_traces(log).values()
+
+    return ([event[0] for event in case] for case in log.values())
+
+
+
+def read_log(flattened_logs):
+
+    logs, _ = build_traces(flattened_logs)
 
     return logs
 
 
 
 def traces(flattened_logs):
-    
-    all_traces = {}
 
-    for o_type, fltlog in flattened_logs.items():
-        if o_type not in all_traces.keys():
-            all_traces[o_type] = {}
-        csv_io = StringIO(fltlog)
-        reader = csv.DictReader(csv_io)
-
-        for row in reader:
-            case_col = next((col for col in reader.fieldnames if col.lower() == 'case:concept:name'), None)
-            task_col = next((col for col in reader.fieldnames if col.lower() == 'concept:name'), None)
-            eid_col = next((col for col in reader.fieldnames if col.lower() == 'ocel:eid'), None)
-            time_col = next((col for col in reader.fieldnames if col.lower() == 'time:timestamp'), None)
-
-            caseID = row.get(case_col)
-            task = row.get(task_col)
-            eid = row.get(eid_col)
-            timestamp = row.get(time_col)
-            event = (task, eid, timestamp)
-
-            if caseID not in all_traces[o_type]:
-                all_traces[o_type][caseID] = []
-            if row.get('case:concept:name') == caseID:
-                all_traces[o_type][caseID].append(task)
+    _, all_traces = build_traces(flattened_logs)
 
     return all_traces
 
@@ -180,6 +895,10 @@ def traces(flattened_logs):
 
 def activity_total(log):
    
+   if isinstance(log, TraceStore):
+      counts = weighted_bincount(log.codes, event_weights(log), len(log.activities))
+      return dict(zip(log.activities, counts.tolist()))
+
    act_total = dict()
    
    for caseID in log:
@@ -192,14 +911,40 @@ def activity_total(log):
    return act_total
 
 
+def trace_statistics(store):
+
+   n_activities = len(store.activities)
+   case_starts = store.offsets[:-1]
+   case_ends = store.offsets[1:]
+   non_empty = case_ends > case_starts
+
+   weights = None if store.weights is None else case_weights(store)[non_empty]
+
+   totals = weighted_bincount(store.codes, event_weights(store), n_activities)
+   starts = weighted_bincount(store.codes[case_starts[non_empty]], weights, n_activities)
+   ends = weighted_bincount(store.codes[case_ends[non_empty] - 1], weights, n_activities)
+
+   act_total = dict(zip(store.activities, totals.tolist()))
+   start_activities = {store.activities[code]: starts[code].item() for code in np.flatnonzero(starts)}
+   end_activities = {store.activities[code]: ends[code].item() for code in np.flatnonzero(ends)}
+
+   original_start = [store.activities[code] for code in np.flatnonzero((totals > 0) & (starts == totals))]
+   original_end = [store.activities[code] for code in np.flatnonzero((totals > 0) & (ends == totals))]
+
+   return TraceStatistics(act_total, start_activities, end_activities, original_start, original_end)
+
+
 def activity_frequencies(log):
    
+   if isinstance(log, TraceStore):
+      return frequency_dict(frequency_matrix(log))
+
    act_frequencies = dict()
 
-   for caseID in log:
-      for i in range(0, len(log[caseID])-1): 
-         ai = log[caseID] [i] [0]
-         aj = log[caseID] [i+1] [0]
+   for case in case_activities(log):
+      for i in range(0, len(case)-1): 
+         ai = case[i]
+         aj = case[i+1]
          if ai not in act_frequencies:
             act_frequencies[ai] = dict()
          if aj not in act_frequencies[ai]:
@@ -223,108 +968,99 @@ def frequencies(act_frequencies):
    return frequencies
 
 
-def in_bindings(activity_frequencies):
-    
+def frequency_matrix(store):
+
+   n_activities = len(store.activities)
+   codes = store.codes.astype(np.int64)
+
+   follows = np.ones(max(len(codes) - 1, 0), dtype=bool)
+   case_starts = store.offsets[1:-1]
+   follows[case_starts[(case_starts > 0) & (case_starts < len(codes))] - 1] = False
+
+   weights = event_weights(store)
+   pairs = codes[:-1][follows] * n_activities + codes[1:][follows]
+   pair_weights = None if weights is None else weights[:-1][follows]
+   counts = weighted_bincount(pairs, pair_weights, n_activities * n_activities).reshape(n_activities, n_activities)
+
+   observed = np.flatnonzero(counts.any(axis=1) | counts.any(axis=0))
+   labels = [store.activities[code] for code in observed]
+
+   frequencies = pd.DataFrame(counts[np.ix_(observed, observed)], index=labels, columns=labels)
+
+   return frequencies
+
+
+def frequency_dict(frequencies):
+
+   act_frequencies = dict()
+   counts = frequencies.to_numpy()
+
+   for i, key in enumerate(frequencies.index):
+      successors = np.flatnonzero(counts[i])
+      act_frequencies[key] = {frequencies.columns[j]: counts[i, j].item() for j in successors}
+      if key not in act_frequencies[key]:
+         act_frequencies[key][key] = 0
+
+   return act_frequencies
+
+
+def frequency_arcs(activity_frequencies):
+
     fr = activity_frequencies
-    in_filter = {}
     in_arcs = {}
-    filtered = []
-    in_bindings = {}
-    all_combinations = []
-
-    inbindings_list = {}
-    value_list = []
-
-
-    for key, value in fr.items():
-        for value in value.keys():
-            if fr[key][value] != 0:
-                filtered.append(value)
-            if value not in in_filter:
-                in_filter[value] = {}
-        in_filter[value] = filtered
-        filtered = []
-
-    for key in in_filter:
-        for i in in_filter[key]:
-            if i not in in_arcs:
-                in_arcs[i] = []
-            in_arcs[i].append(key)
-        
-    for key in in_arcs:
-        if key not in in_bindings:
-            in_bindings[key] = {}
-            n = len(in_arcs[key])
-        while n > 0:
-            combinations_list = list(combinations(in_arcs[key], n))
-            all_combinations.extend(combinations_list)
-            n -= 1
-        in_bindings[key] = all_combinations
-        all_combinations = []
-    
-    for key,value in in_bindings.items():
-        for i in value:
-            j = []
-            for a in i:
-                j.append(a)
-            value_list.append(j)
-        
-        inbindings_list[key] = value_list
-        value_list = []
+    out_arcs = {}
+
+    for key in fr:
+        out_arcs[key] = [value for value in fr[key] if fr[key][value] != 0]
+        for value in out_arcs[key]:
+            if value not in in_arcs:
+                in_arcs[value] = []
+            in_arcs[value].append(key)
+
+    return in_arcs, out_arcs
 
-    
-    return inbindings_list
 
+def candidate_bindings(arcs, max_size=None):
 
-def out_bindings(activity_frequencies):
+    n = len(arcs) if max_size is None else min(len(arcs), max_size)
+
+    while n > 0:
+        for binding in combinations(arcs, n):
+            yield list(binding)
+        n -= 1
+
+
+def in_bindings(activity_frequencies, max_size=None):
     
-    fr = activity_frequencies
+    in_arcs, _ = frequency_arcs(activity_frequencies)
 
-    out_arcs = {}
-    filtered = []
-    out_bindings = {}
-    all_combinations = []
+    return {key: candidate_bindings(arcs, max_size) for key, arcs in in_arcs.items()}
 
-    outbindings_list = {}
-    value_list = []
 
-    for key in fr:
-        for value in fr[key]:
-            if fr[key][value] != 0:
-                filtered.append(value)
-        if key not in out_arcs:
-            out_arcs[key] = {}
-            out_arcs[key] = filtered
-        filtered = []
-
-    for key in out_arcs:
-        if key not in out_bindings:
-            out_bindings[key] = {}
-            n = len(out_arcs[key])
-        while n > 0:
-            combinations_list = list(combinations(out_arcs[key], n))
-            all_combinations.extend(combinations_list)
-            n -= 1
-        out_bindings[key] = all_combinations
-        all_combinations = []
+def out_bindings(activity_frequencies, max_size=None):
     
+    _, out_arcs = frequency_arcs(activity_frequencies)
 
-    for key,value in out_bindings.items():
-        for i in value:
-            j = []
-            for a in i:
-                j.append(a)
-            value_list.append(j)
-        
-        outbindings_list[key] = value_list
-        value_list = []
+    return {key: candidate_bindings(arcs, max_size) for key, arcs in out_arcs.items()}
 
-    return outbindings_list
+
+def observed_in_bindings(traces, activity_frequencies):
+
+    in_arcs, out_arcs = frequency_arcs(activity_frequencies)
+
+    return input_bindings(traces, out_arcs, in_arcs)
+
+
+def observed_out_bindings(traces, activity_frequencies):
+
+    in_arcs, out_arcs = frequency_arcs(activity_frequencies)
+
+    return output_bindings(traces, out_arcs, in_arcs)
 
 
 def original_start(act_total, activity_freq):
    
-   incoming = in_bindings(activity_freq)
+   incoming, _ = frequency_arcs(activity_freq)
    original_start = list()
 
    for act in act_total.keys():
@@ -337,7 +1073,7 @@ def original_start(act_total, activity_freq):
 
 def original_end(act_total, activity_freq):
    
-   outgoing = out_bindings(activity_freq)
+   _, outgoing = frequency_arcs(activity_freq)
    original_end = list()
 
    for act in act_total.keys():
@@ -352,21 +1088,14 @@ def original_end(act_total, activity_freq):
 
 def dependency_matrix(frequencies):
 
-   freq = frequencies
+   labels = frequencies.index
+   freq = frequencies.reindex(columns=labels).to_numpy(dtype=np.float64)
 
-   def calculate_dependency(pair):
-      a, b = pair
-      if b == a:
-         return freq.loc[a,b]/(freq.loc[a,b] + 1)
-      else:
-         return (freq.loc[a,b] - freq.loc[b,a])/(freq.loc[a,b] + freq.loc[b,a] + 1)
-                  
-   
-   dependency_matrix = pd.DataFrame(index=freq.index, columns=freq.columns)
+   dependency = (freq - freq.T) / (freq + freq.T + 1)
+   self_loops = np.diag(freq)
+   np.fill_diagonal(dependency, self_loops / (self_loops + 1))
 
-   for col in freq.columns:
-      for index in freq.index:
-         dependency_matrix.loc[index,col] = calculate_dependency((index,col))
+   dependency_matrix = pd.DataFrame(dependency, index=labels, columns=labels).reindex(columns=frequencies.columns)
 
    return dependency_matrix
 
@@ -378,372 +1107,737 @@ def dependency_dict(dependency_matrix):
    return dependency_dict
 
 
+def occurrence_index(store):
+
+    n_activities = len(store.activities)
+    n_cases = len(store.cases)
+    n_events = len(store.codes)
+
+    case_of = np.repeat(np.arange(n_cases, dtype=np.int64), np.diff(store.offsets))
+    keys = case_of * n_activities + store.codes
+
+    entry_keys, first = np.unique(keys, return_index=True)
+    _, last_reversed = np.unique(keys[::-1], return_index=True)
+    last = n_events - 1 - last_reversed
+
+    offsets = np.searchsorted(entry_keys // max(n_activities, 1), np.arange(n_cases + 1)).astype(np.int64)
+
+    return OccurrenceIndex(offsets, (entry_keys % max(n_activities, 1)).astype(np.int32), first.astype(np.int64), last.astype(np.int64))
+
+
+def between_counts(store, chunk_size=4_000_000, rows=None):
+
+    n_activities = len(store.activities)
+    n_events = len(store.codes)
+    codes = store.codes.astype(np.int64)
+    counts = np.zeros(n_activities * n_activities, dtype=np.int64)
+
+    index = occurrence_index(store)
+    case_of = np.repeat(np.arange(len(store.cases), dtype=np.int64), np.diff(store.offsets))
+    weights = None if store.weights is None else case_weights(store)
+
+    run_breaks = np.ones(n_events, dtype=bool)
+    run_breaks[1:] = (codes[1:] != codes[:-1]) | (case_of[1:] != case_of[:-1])
+    run_starts = np.flatnonzero(run_breaks)
+    run_of = np.cumsum(run_breaks) - 1
+
+    next_run = np.minimum(run_of + 1, len(run_starts) - 1)
+    after_run = run_starts[next_run] if n_events > 0 else np.zeros(0, dtype=np.int64)
+    positions = np.flatnonzero((run_of + 1 < len(run_starts)) & (case_of[after_run] == case_of))
+    if rows is not None:
+        positions = positions[np.isin(codes[positions], rows)]
+
+    case_entries = np.diff(index.offsets)
+    entries_per_position = case_entries[case_of[positions]]
+    chunk_bounds = np.searchsorted(np.cumsum(entries_per_position), np.arange(0, entries_per_position.sum() + chunk_size, chunk_size), side='right')
+
+    for lo, hi in zip(chunk_bounds[:-1], chunk_bounds[1:]):
+        if hi <= lo:
+            continue
+        p = positions[lo:hi]
+        n_entries = entries_per_position[lo:hi]
+        repeat = np.repeat(np.arange(len(p)), n_entries)
+        entry = np.repeat(index.offsets[case_of[p]] - (np.cumsum(n_entries) - n_entries), n_entries) + np.arange(n_entries.sum())
+
+        a = codes[p][repeat]
+        r = after_run[p][repeat]
+        b = index.codes[entry].astype(np.int64)
+        b_last = index.last[entry]
+
+        between = (b_last > r) & (b != codes[r]) & ((b != a) | (r == p[repeat] + 1))
+        pair_weights = None if weights is None else weights[case_of[p][repeat]][between]
+        counts += weighted_bincount(a[between] * n_activities + b[between], pair_weights, n_activities * n_activities)
+
+    between_counts = pd.DataFrame(counts.reshape(n_activities, n_activities), index=store.activities, columns=store.activities)
+
+    return between_counts
+
+
 def count_occurrences_between(traces, a, b):
     
-    def count_occurrences_recursive(trace, a, b):
-        
-        count = 0
-        if a in trace:
-            a_indices = [i for i, activity in enumerate(trace) if activity == a]
-            for a_index in a_indices:
-                remaining_trace = trace[a_index+1:]
-                if b in remaining_trace:
-                    b_index = remaining_trace.index(b)
-                    if any(activity != a and activity != b for activity in remaining_trace[:b_index]):
-                        count += 1
-                    count += count_occurrences_recursive(remaining_trace, a, b)
-        return count
-
-    total_count = 0
-    for trace_id, trace in traces.items():
-        trace_count = count_occurrences_recursive(trace, a, b)
-        total_count += trace_count
-
-    return total_count
+    store = traces if isinstance(traces, TraceStore) else trace_store(traces)
+
+    if a not in store.vocabulary or b not in store.vocabulary:
+        return 0
+
+    return between_counts(store).loc[a, b].item()
+
+
+def reachability_index(store, targets=None):
+
+    n_activities = len(store.activities)
+    offsets = store.offsets.tolist()
+
+    target_codes = np.arange(n_activities) if targets is None else np.unique(np.asarray(targets, dtype=np.int64))
+    target_position = np.full(n_activities, -1, dtype=np.int64)
+    target_position[target_codes] = np.arange(len(target_codes))
+
+    avoid = np.zeros((n_activities, len(target_codes), (n_activities + 7) // 8), dtype=np.uint8)
+
+    variants = {store.codes[offsets[i]:offsets[i+1]].tobytes() for i in range(len(store.cases))}
+
+    for variant in variants:
+        trace = np.frombuffer(variant, dtype=np.int32)
+        present, first, local = np.unique(trace, return_index=True, return_inverse=True)
+        if len(present) < 2:
+            continue
+
+        order = np.argsort(first)
+        ranked = present[order]
+        positions = first[order]
+
+        starts, ends = np.triu_indices(len(present), k=1)
+        selected = target_position[ranked[ends]] >= 0
+        starts, ends = starts[selected], ends[selected]
+        if len(starts) == 0:
+            continue
+
+        seen = np.zeros((len(trace) + 1, len(present)), dtype=np.int32)
+        seen[np.arange(1, len(trace) + 1), local] = 1
+        seen = np.cumsum(seen, axis=0)
+
+        visited = seen[positions[ends]] - seen[positions[starts] + 1] > 0
+
+        ts = ranked[starts]
+        te = ranked[ends]
+
+        avoided = np.ones((len(ts), n_activities), dtype=bool)
+        avoided[:, present] = ~visited
+        avoid[ts, target_position[te]] |= np.packbits(avoided, axis=1)
+
+    return ReachabilityIndex(store.activities, store.vocabulary, target_position, avoid)
+
+
+def avoided_paths(index, starts, ends, intermediaries):
+
+    starts = np.asarray(starts, dtype=np.int64)
+    ends = np.asarray(ends, dtype=np.int64)
+    intermediaries = np.asarray(intermediaries, dtype=np.int64)
+
+    packed = index.avoid[np.ix_(starts, index.target_position[ends])]
+    bits = (np.uint8(0x80) >> (intermediaries & 7).astype(np.uint8))
+
+    return (packed[:, :, intermediaries >> 3] & bits) != 0
+
+
+def reachability_avoided(indexes, activities, starts, ends, intermediaries):
+
+    starts = np.asarray(starts, dtype=np.int64)
+    ends = np.asarray(ends, dtype=np.int64)
+    intermediaries = np.asarray(intermediaries, dtype=np.int64)
+    avoided = np.zeros((len(starts), len(ends), len(intermediaries)), dtype=bool)
+
+    for index in indexes:
+        local = np.array([index.vocabulary.get(activity, -1) for activity in activities], dtype=np.int64)
+        local_starts, local_ends, local_intermediaries = local[starts], local[ends], local[intermediaries]
+
+        has_start = local_starts >= 0
+        has_end = local_ends >= 0
+        has_end[has_end] = index.target_position[local_ends[has_end]] >= 0
+        if not has_start.any() or not has_end.any():
+            continue
+
+        local_starts, local_ends = local_starts[has_start], local_ends[has_end]
+        found = avoided_paths(index, local_starts, local_ends, np.maximum(local_intermediaries, 0))
+        observed = np.diagonal(avoided_paths(index, local_starts, local_ends, local_ends), axis1=1, axis2=2)
+        found[:, :, local_intermediaries < 0] = observed[:, :, None]
+
+        avoided[np.ix_(has_start, has_end)] |= found
+
+    return avoided
 
 
 def path_exists_from_to_without_visiting(ts, te, intermediary, traces):
+
+    starts = ts if isinstance(ts, (list, tuple, set)) else [ts]
+    ends = te if isinstance(te, (list, tuple, set)) else [te]
+
+    if isinstance(traces, ReachabilityIndex):
+        ts_codes = [traces.vocabulary[act] for act in starts if act in traces.vocabulary]
+        te_codes = [traces.vocabulary[act] for act in ends if act in traces.vocabulary and traces.target_position[traces.vocabulary[act]] >= 0]
+        if intermediary in traces.vocabulary:
+            avoided = avoided_paths(traces, ts_codes, te_codes, [traces.vocabulary[intermediary]])
+        else:
+            avoided = np.diagonal(avoided_paths(traces, ts_codes, te_codes, te_codes), axis1=1, axis2=2)
+        return bool(avoided.any())
+
+    traces = as_traces(traces)
     for trace in traces.values():
-        if ts in trace and te in trace:
-            ts_index = trace.index(ts)
-            te_index = trace.index(te)
-            if ts_index < te_index:
-                
-                subsequence = trace[ts_index + 1:te_index]
-                
-                if intermediary not in subsequence:
-                    
-                    return True
+        for ts in starts:
+            for te in ends:
+                if ts in trace and te in trace:
+                    ts_index = trace.index(ts)
+                    te_index = trace.index(te)
+                    if ts_index < te_index:
+                        
+                        subsequence = trace[ts_index + 1:te_index]
+                        
+                        if intermediary not in subsequence:
+                            
+                            return True
     
     return False
 
 
 
-def long_distance_dependency(act_total, traces, start_activity, end_activity, AbsUseThres=1, AbsThres=0.95):
+def long_distance_dependency(act_total, traces, start_activity, end_activity, AbsUseThres=1, AbsThres=0.95, return_pruned=False):
+
+    if isinstance(traces, (TraceStore, LongDistanceCounts)):
+        store = traces
+    else:
+        store = trace_store(traces)
 
-    
     long_dep = {a: {b: 0 for b in act_total if b not in start_activity} for a in act_total if a not in start_activity}
 
-    for a in act_total:
-        if a in start_activity:
-            continue
-        freq_a = act_total[a]
-        for b in act_total:
-            if b in start_activity or a == b:
-                continue
-            freq_b = act_total[b]
-            
-            for end_activity in end_activity:
-                
-                if path_exists_from_to_without_visiting(a, end_activity, b, traces) == False or path_exists_from_to_without_visiting(start_activity, end_activity, a, traces) == False or path_exists_from_to_without_visiting(start_activity, end_activity, b, traces) == False:
-                    
-                    count_ab = count_occurrences_between(traces, a, b)
-                    
-                    n_events = freq_a + freq_b
-                    
-                    LongDistanceDependency = (2 * count_ab) / (n_events + 1) - (2 * abs(freq_a - freq_b)) / (n_events + 1)
-                    
-                    if count_ab >= AbsUseThres and LongDistanceDependency >= AbsThres:
-                        
-                        long_dep[a][b] = LongDistanceDependency
-                    break
+    candidates = [act for act in long_dep if act in store.vocabulary]
+    codes = np.array([store.vocabulary[act] for act in candidates], dtype=np.int64)
+    start_codes = [store.vocabulary[act] for act in start_activity if act in store.vocabulary]
+    end_codes = [store.vocabulary[act] for act in end_activity if act in store.vocabulary]
+
+    if len(codes) < 2 or len(end_activity) == 0:
+        return (long_dep, 0) if return_pruned else long_dep
+
+    freq = np.array([act_total[act] for act in candidates], dtype=np.float64)
+    n_events = freq[:, None] + freq[None, :]
+    imbalance = (2 * np.abs(freq[:, None] - freq[None, :])) / (n_events + 1)
+
+    if isinstance(store, LongDistanceCounts):
+        totals = store.totals
+    else:
+        totals = weighted_bincount(store.codes, event_weights(store), len(store.activities))
+
+    max_count = totals[codes].astype(np.float64)[:, None]
+    bound = (2 * max_count) / (n_events + 1) - imbalance
+
+    promising = (bound >= AbsThres) & (max_count >= AbsUseThres)
+    np.fill_diagonal(promising, False)
+    pruned = len(codes) * (len(codes) - 1) - int(promising.sum())
+
+    if not promising.any():
+        return (long_dep, pruned) if return_pruned else long_dep
+
+    if isinstance(store, LongDistanceCounts):
+        indexes = store.reachability
+        between = store.between
+    else:
+        indexes = [reachability_index(store, targets=end_codes)]
+        between = between_counts(store, rows=codes[promising.any(axis=1)]).to_numpy()
+
+    a_to_end = reachability_avoided(indexes, store.activities, codes, end_codes, codes)
+    start_to_end = reachability_avoided(indexes, store.activities, start_codes, end_codes, codes).any(axis=0)
+
+    eligible = (~a_to_end | ~start_to_end.T[:, :, None] | ~start_to_end[None, :, :]).any(axis=1)
+    eligible |= len(end_codes) < len(end_activity)
+    eligible &= promising
+
+    count = between[np.ix_(codes, codes)]
+
+    dependency = (2 * count) / (n_events + 1) - imbalance
+    accepted = eligible & (count >= AbsUseThres) & (dependency >= AbsThres)
 
-    return long_dep
+    for i, j in zip(*np.nonzero(accepted)):
+        long_dep[candidates[i]][candidates[j]] = dependency[i, j].item()
+
+    return (long_dep, pruned) if return_pruned else long_dep
+
+
+def best_mask(dependency_matrix, axis):
+
+    values = dependency_matrix.to_numpy(dtype=np.float64)
+
+    if values.size == 0:
+        return np.zeros(values.shape, dtype=bool)
+
+    best = values.max(axis=axis, keepdims=True)
+
+    return (values == best) & (values > 0)
 
 
 def best_dependency(dependency_dict):
     
-    best_dependency = {}
+    if isinstance(dependency_dict, pd.DataFrame):
+        dependency_matrix = dependency_dict
+    else:
+        dependency_matrix = pd.DataFrame.from_dict(dependency_dict, orient='index')
 
-    for key,value in dependency_dict.items():
-        best={k:v for k,v in value.items() if v==max(value.values()) and v > 0}
-        if key not in best_dependency:
-            best_dependency[key] = {}
-        best_dependency[key] = best
+    values = dependency_matrix.to_numpy(dtype=np.float64)
+    rows, cols = np.nonzero(best_mask(dependency_matrix, axis=1))
+
+    best_dependency = {key: {} for key in dependency_matrix.index}
+
+    for row, col in zip(rows.tolist(), cols.tolist()):
+        best_dependency[dependency_matrix.index[row]][dependency_matrix.columns[col]] = values[row, col]
         
     return best_dependency
 
 def best_predecessor(dependency_matrix):
     
-    best_predecessors = {}
-    
-    dependency_by_columns_dict = dependency_matrix.to_dict()
+    values = dependency_matrix.to_numpy(dtype=np.float64)
+    cols, rows = np.nonzero(best_mask(dependency_matrix, axis=0).T)
+
+    best_predecessors = {key: {} for key in dependency_matrix.columns}
 
-    for key,value in dependency_by_columns_dict.items():
-        best_predecessor = {k:v for k,v in value.items() if v==max(value.values()) and v > 0}
-        if key not in best_predecessors:
-            best_predecessors[key] = {}
-        best_predecessors[key] = best_predecessor
+    for row, col in zip(rows.tolist(), cols.tolist()):
+        best_predecessors[dependency_matrix.columns[col]][dependency_matrix.index[row]] = values[row, col]
         
     return best_predecessors
 
 
+class DependencyGraph:
+
+    def __init__(self, is_directed=True):
+        self.is_directed = is_directed
+        self.nodes = []
+        self.node_set = set()
+        self.arcs = []
+        self.arc_set = set()
+        self.successors = {}
+        self.predecessors = {}
+        self.long_distance = {}
+
+    @property
+    def edges(self):
+        return self.arcs + [edge + (label,) for edge, label in self.long_distance.items()]
+
+    def add_node(self, node):
+        if node not in self.node_set:
+            self.node_set.add(node)
+            self.nodes.append(node)
+
+    def add_edge(self, source, target):
+        edge = (source, target)
+        if edge in self.arc_set:
+            return False
+        self.arc_set.add(edge)
+        self.arcs.append(edge)
+        self.successors.setdefault(source, []).append(target)
+        self.predecessors.setdefault(target, []).append(source)
+        return True
+
+    def add_long_distance_edge(self, source, target, label):
+        edge = (source, target)
+        if edge in self.arc_set or edge in self.long_distance:
+            return False
+        self.long_distance[edge] = label
+        return True
+
+    def has_edge(self, source, target):
+        return (source, target) in self.arc_set
+
+
+
 def dependency_graph(activity_total, original_start, original_end, frequencies, dep_matrix, dependency_dict, long_dep, dependency_threshold):
     
     long_distance=0.9
     act_threshold=1
 
-    Graph = namedtuple("Graph", ["nodes", "edges", "is_directed"])
-    dep_graph = Graph
-    dep_graph.nodes = []
-    dep_graph.edges = []
-    dep_graph.is_directed = True
+    dep_graph = DependencyGraph(is_directed=True)
 
-    original_start = original_start
     start_act = list()
-    original_end = original_end
     end_act = list()
 
-    next_best = best_dependency(dependency_dict)
+    next_best = best_dependency(dep_matrix)
     best_pred = best_predecessor(dep_matrix)
     only_one_predecessor = {}
 
+    starts = set(original_start)
+    ends = set(original_end)
+
     
     for key,value in activity_total.items():
-        if value >= act_threshold and key not in dep_graph.nodes:
-            dep_graph.nodes.append(key)
+        if value >= act_threshold:
+            dep_graph.add_node(key)
 
     
-    for node in dep_graph.nodes:
-        if node not in original_end and node not in end_act:
+    for node in list(dep_graph.nodes):
+        if node not in ends:
             best = [k for k,v in dependency_dict[node].items() if v > dependency_threshold]
             if len(best) == 0:
                 best = next_best[node]
             for successor in best:
-                act_edge = (node,successor)
-                if act_edge not in dep_graph.edges:
-                    dep_graph.edges.append(act_edge)
+                dep_graph.add_edge(node, successor)
     
-            for edge in dep_graph.edges:
-                if node not in edge[1]:
-                    if node in best_pred:
-                        pred = best_pred[node]
-                    else:
-                        continue
-                    for predecessor in pred:
-                        pred_edge = (predecessor,node)
-                        if predecessor != node and pred_edge not in dep_graph.edges:
-                            dep_graph.edges.append(pred_edge)
-                        else:
-                            continue
+            
+            if node in best_pred and any(node not in target for target in dep_graph.predecessors):
+                for predecessor in best_pred[node]:
+                    if predecessor != node:
+                        dep_graph.add_edge(predecessor, node)
        
      
     if len(original_start) > 1:
         start = 'start'
         for act in original_start:
-            act_edge = (start,act)
-            if act_edge not in dep_graph.edges:
-                dep_graph.edges.append(act_edge)
+            dep_graph.add_edge(start, act)
         start_act.append(start)
-        dep_graph.nodes.append(start)
+        dep_graph.add_node(start)
 
    
     if len(original_end) > 1:
         end = 'end'
         for act in original_end:
-            act_edge = (act,end)
-            if act_edge not in dep_graph.edges:
-                dep_graph.edges.append(act_edge)
+            dep_graph.add_edge(act, end)
         end_act.append(end)
-        dep_graph.nodes.append(end)
+        dep_graph.add_node(end)
    
     
-    for col in frequencies.columns:
-       
-        row_index = frequencies.index[frequencies[col] > 0].tolist()
-        
-        if len(row_index) == 1:
-            only_one_predecessor[col] = row_index[0]
+    positive = frequencies.to_numpy() > 0
+    for col in np.flatnonzero(positive.sum(axis=0) == 1):
+        only_one_predecessor[frequencies.columns[col]] = frequencies.index[np.argmax(positive[:, col])]
 
     
     for key in only_one_predecessor.keys():            
-        if key not in [edge[1] for edge in dep_graph.edges]:
-            dep_graph.edges.append(tuple((only_one_predecessor[key], key)))
+        if key not in dep_graph.predecessors:
+            dep_graph.add_edge(only_one_predecessor[key], key)
             
 
-    
-    for node in dep_graph.nodes:
-        if node not in original_start and node not in start_act and node not in original_end and node not in end_act:
-            for k,v in long_dep[node].items():
-                if v > long_distance and k not in original_end:
-                    act_edge = (node, k)
-                    if act_edge not in dep_graph.edges:
-                        label = ("(" + str(round(v, 2)) + ")")
-                        dep_graph.edges.append(act_edge + (label,))
+    
+    for node in dep_graph.nodes:
+        if node not in starts and node not in start_act and node not in ends and node not in end_act:
+            for k,v in long_dep[node].items():
+                if v > long_distance and k not in ends:
+                    label = ("(" + str(round(v, 2)) + ")")
+                    dep_graph.add_long_distance_edge(node, k, label)
+
+    return dep_graph
+
+
+def input_arcs(dep_graph):
+
+    if isinstance(dep_graph, DependencyGraph):
+        return {node: list(dep_graph.predecessors.get(node, [])) for node in dep_graph.nodes}
+    
+    in_arcs = []
+    in_bindings = {}
+
+    for node in dep_graph.nodes:
+        if node not in ['start', 'end'] and node not in in_bindings.keys():
+            in_bindings[node] = []
+        for edge in dep_graph.edges:
+            if len(edge) == 2 and edge[1] == node and edge[0] not in in_arcs:
+                in_arcs.append(edge[0])
+        in_bindings[node] = in_arcs
+        in_arcs = []
+
+    return in_bindings
+
+
+def output_arcs(dep_graph):
+
+    if isinstance(dep_graph, DependencyGraph):
+        return {node: list(dep_graph.successors.get(node, [])) for node in dep_graph.nodes}
+    
+    out_arcs = []
+    out_bindings = {}
+
+    for node in dep_graph.nodes:
+        if node not in ['start', 'end'] and node not in out_bindings.keys():
+            out_bindings[node] = []
+        for edge in dep_graph.edges:
+            if len(edge) == 2 and edge[0] == node and edge[1] not in out_arcs:
+                out_arcs.append(edge[1])
+        out_bindings[node] = out_arcs
+        out_arcs = []
+
+    return out_bindings
+
+
+def output_bindings(traces, out_arcs, in_arcs):
+    
+    outbindings = {key: Counter() for key in out_arcs if key != 'start' and key != 'end'}
+
+    
+    targets = {activity: [(arc, [other for other in in_arcs.get(arc, []) if other != arc]) for arc in arcs if arc != activity] for activity, arcs in out_arcs.items()}
+    self_loops = {activity for activity, arcs in out_arcs.items() if activity in arcs}
+
+    
+    for trace, weight in weighted_traces(traces):
+        trace_end = len(trace)
+        next_occurrence = {}
+        found = []
+
+        
+        for position in range(trace_end - 1, -1, -1):
+            activity = trace[position]
+
+            if activity in outbindings:
+                window_end = next_occurrence.get(activity, trace_end)
+                binding = [activity] if window_end == position + 1 and activity in self_loops else []
+
+                for arc, others in targets[activity]:
+                    arc_position = next_occurrence.get(arc, trace_end)
+                    
+                    if arc_position < window_end and all(next_occurrence.get(other, trace_end) > arc_position for other in others):
+                        binding.append(arc)
+
+                if binding:
+                    found.append((activity, tuple(sorted(binding))))
+
+            next_occurrence[activity] = position
+
+        
+        for activity, binding in reversed(found):
+            outbindings[activity][binding] += weight
+
+
+    cnet_outbindings = {key: dict(bindings_counter) for key, bindings_counter in outbindings.items()}
+
+    return cnet_outbindings
+
+
+def input_bindings(traces, out_arcs, in_arcs):
+    
+    inbindings = {key: Counter() for key in in_arcs if key != 'start' and key != 'end'}
+
+    
+    sources = {activity: [(arc, out_arcs.get(arc, [])) for arc in arcs] for activity, arcs in in_arcs.items()}
+
+    
+    def window_binding(activity, window_start, last_occurrence, weight):
+        binding = tuple(sorted({arc for arc in in_arcs[activity] if last_occurrence.get(arc, -1) >= window_start}))
+        if binding:
+            inbindings[activity][binding] += weight
+
+    
+    for trace, weight in weighted_traces(traces):
+        first_occurrence = {}
+        last_occurrence = {}
+
+        for position, activity in enumerate(trace):
+
+            if activity in inbindings:
+                
+                if activity in last_occurrence:
+                    window_binding(activity, last_occurrence[activity], last_occurrence, weight)
+
+                elif position == 1 and trace[0] in in_arcs[activity]:
+                    inbindings[activity][(trace[0],)] += weight
+
+                elif position > 1:
+                    binding = set()
+                    for arc, others in sources[activity]:
+                        arc_position = position if arc == activity else first_occurrence.get(arc)
+                        if arc_position is None:
+                            continue
+                        
+                        if not any(arc_position < first_occurrence.get(other, position) < position for other in others):
+                            binding.add(arc)
+                    if binding:
+                        inbindings[activity][tuple(sorted(binding))] += weight
+
+            first_occurrence.setdefault(activity, position)
+            last_occurrence[activity] = position
+
+        
+        for activity, window_start in last_occurrence.items():
+            if activity in inbindings:
+                window_binding(activity, window_start, last_occurrence, weight)
+
 
-    return dep_graph
+    cnet_inbindings = {key: dict(bindings_counter) for key, bindings_counter in inbindings.items()}
 
+    return cnet_inbindings
 
-def input_arcs(dep_graph):
-    
-    in_arcs = []
-    in_bindings = {}
 
-    for node in dep_graph.nodes:
-        if node not in ['start', 'end'] and node not in in_bindings.keys():
-            in_bindings[node] = []
-        for edge in dep_graph.edges:
-            if len(edge) == 2 and edge[1] == node and edge[0] not in in_arcs:
-                in_arcs.append(edge[0])
-        in_bindings[node] = in_arcs
-        in_arcs = []
+def merge_bindings(shard_bindings):
 
-    return in_bindings
+    merged = {}
 
+    for bindings in shard_bindings:
+        for key, bindings_counter in bindings.items():
+            merged.setdefault(key, Counter()).update(bindings_counter)
 
-def output_arcs(dep_graph):
-    
-    out_arcs = []
-    out_bindings = {}
+    return {key: dict(bindings_counter) for key, bindings_counter in merged.items()}
 
-    for node in dep_graph.nodes:
-        if node not in ['start', 'end'] and node not in out_bindings.keys():
-            out_bindings[node] = []
-        for edge in dep_graph.edges:
-            if len(edge) == 2 and edge[0] == node and edge[1] not in out_arcs:
-                out_arcs.append(edge[1])
-        out_bindings[node] = out_arcs
-        out_arcs = []
 
-    return out_bindings
 
+def mine_shard(shared, activities, first_case, last_case, out_arcs, in_arcs):
 
-def output_bindings(traces, out_arcs, in_arcs):
-    
+    codes_block = shared_memory.SharedMemory(name=shared.codes)
+    offsets_block = shared_memory.SharedMemory(name=shared.offsets)
+    weights_block = shared_memory.SharedMemory(name=shared.weights)
 
-    outbindings = {}
+    try:
+        offsets = np.ndarray((shared.n_cases + 1,), dtype=np.int64, buffer=offsets_block.buf)[first_case:last_case+1].copy()
+        codes = np.ndarray((shared.n_events,), dtype=np.int32, buffer=codes_block.buf)[offsets[0]:offsets[-1]].copy()
+        weights = np.ndarray((shared.n_cases,), dtype=np.int64, buffer=weights_block.buf)[first_case:last_case].copy()
+    finally:
+        codes_block.close()
+        offsets_block.close()
+        weights_block.close()
 
-    
-    for activity in out_arcs:
-        outbindings[activity] = []
+    vocabulary = {activity: code for code, activity in enumerate(activities)}
+    ot_traces = TraceStore(activities, vocabulary, list(range(first_case, last_case)), codes, offsets - offsets[0], weights)
 
-        
-        for trace in traces.values():
-            bindings = []
-            occurrences = [i for i, x in enumerate(trace) if x == activity]
+    return output_bindings(ot_traces, out_arcs, in_arcs), input_bindings(ot_traces, out_arcs, in_arcs)
 
-            for i in range(len(occurrences)):
-                start_index = occurrences[i]
-                end_index = occurrences[i+1] if i < len(occurrences) - 1 else len(trace)
-                binding = []
-                search_space = trace[start_index:end_index]  
 
-                for arc in out_arcs[activity]:
-                    
-                    if arc == activity and len(search_space) == 1:
-                        binding.append(arc)
-                    
-                    if arc not in search_space:
-                        continue
 
-                    
-                    if not any(other in search_space and search_space.index(other) > search_space.index(activity) and search_space.index(other) < search_space.index(arc) for other in in_arcs.get(arc, [])):
-                        
-                        if arc != activity:
-                            binding.append(arc)
+def sharded_bindings(store, out_arcs, in_arcs, processes, shards_per_process=4):
 
-                
-                if binding:
-                    bindings.append(binding)
+    n_cases = len(store.cases)
+    n_shards = min(n_cases, processes * shards_per_process)
 
-            
-            outbindings[activity].extend(bindings)
+    if n_shards < 2:
+        return output_bindings(store, out_arcs, in_arcs), input_bindings(store, out_arcs, in_arcs)
 
-   
-    cnet_outbindings = {}
+    
+    bounds = np.searchsorted(store.offsets, np.linspace(0, store.offsets[-1], n_shards + 1)[1:-1])
+    bounds = np.unique(np.concatenate(([0], np.clip(bounds, 1, n_cases - 1), [n_cases])))
 
+    codes = np.ascontiguousarray(store.codes, dtype=np.int32)
+    offsets = np.ascontiguousarray(store.offsets, dtype=np.int64)
+    weights = case_weights(store)
+    codes_block = shared_memory.SharedMemory(create=True, size=max(codes.nbytes, 1))
+    offsets_block = shared_memory.SharedMemory(create=True, size=offsets.nbytes)
+    weights_block = shared_memory.SharedMemory(create=True, size=weights.nbytes)
 
-    for key, value in outbindings.items():
-        if key != 'start' and key!= 'end':
-            
-            flattened_values = [tuple(sublist) for sublist in value]
-            
-            sorted_values = [tuple(sorted(sublist)) for sublist in flattened_values]
-            
-            bindings_counter = Counter(sorted_values)
-            
-            cnet_outbindings[key] = dict(bindings_counter)
+    try:
+        np.ndarray(codes.shape, dtype=np.int32, buffer=codes_block.buf)[:] = codes
+        np.ndarray(offsets.shape, dtype=np.int64, buffer=offsets_block.buf)[:] = offsets
+        np.ndarray(weights.shape, dtype=np.int64, buffer=weights_block.buf)[:] = weights
+        shared = SharedStore(codes_block.name, offsets_block.name, weights_block.name, len(codes), n_cases)
 
-    return cnet_outbindings
+        n_shards = len(bounds) - 1
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            shards = list(executor.map(mine_shard, [shared] * n_shards, [store.activities] * n_shards, bounds[:-1].tolist(), bounds[1:].tolist(), [out_arcs] * n_shards, [in_arcs] * n_shards))
 
+    finally:
+        codes_block.close()
+        codes_block.unlink()
+        offsets_block.close()
+        offsets_block.unlink()
+        weights_block.close()
+        weights_block.unlink()
 
-def input_bindings(traces, out_arcs, in_arcs):
-    
-    inbindings = {}
+    return merge_bindings(shard[0] for shard in shards), merge_bindings(shard[1] for shard in shards)
 
-    
-    for activity in in_arcs:
-        inbindings[activity] = []
 
-        
-        for trace in traces.values():
-            bindings = []
-            first_occ_binding = []
 
-            occurrences = [i for i, x in enumerate(trace) if x == activity]
-            
-            if occurrences:
-                if len(trace[:occurrences[0]]) == 1 and trace[0] in in_arcs[activity]:
-                    bindings.append([trace[0]])
-                elif len(trace[:occurrences[0]]) > 1:
-                    for element in trace[:occurrences[0]+1]:
-                        if element not in in_arcs[activity]:
-                            continue
-                        else:
-                            
-                            if not any(other in trace[:occurrences[0]+1] and trace[:occurrences[0]+1].index(other) < trace[:occurrences[0]+1].index(activity) and trace[:occurrences[0]+1].index(other) > trace[:occurrences[0]+1].index(element) for other in out_arcs.get(element, [])):
-                                first_occ_binding.append(element)
-                    if first_occ_binding:
-                        bindings.append(first_occ_binding)
-                        first_occ_binding = []
-                
+def binding_node_table(cnet_bindings, seq, outgoing):
 
-            for i in range(len(occurrences)):
-                start_index = occurrences[i]
-                end_index = occurrences[i+1] if i < len(occurrences) - 1 else None
-                binding = []
-                search_space = trace[start_index:end_index]  
+    anchor, member = ('source', 'target') if outgoing else ('target', 'source')
+    prefix, node_type, shape = ('o_', 'outbinding', 'point') if outgoing else ('i_', 'inbinding', 'diamond')
 
+    table = pd.DataFrame(
+        [(activity, binding, count) for activity, bindings in cnet_bindings.items() for binding, count in bindings.items()],
+        columns=[anchor, 'binding', 'count'])
+    table['len_binding'] = table['binding'].map(len).astype(np.int64)
+    table[member] = table['binding']
+    table = table.explode(member, ignore_index=True)
 
-                for arc in in_arcs[activity]:
-                    
-                    if arc not in search_space:
-                        continue
+    multiple = (table['len_binding'] > 1).to_numpy()
+    pair = table[anchor] + ' - ' + table[member]
 
-                    
-                    if not any(other in search_space and search_space.index(other) < search_space.index(activity) and search_space.index(other) > search_space.index(arc) for other in out_arcs.get(arc, [])):
-                        binding.append(arc)
+    table['node'] = (prefix + pd.RangeIndex(seq, seq + len(table)).astype(str)).to_numpy()
+    table['type'] = node_type
+    table['label'] = np.where(multiple, None, table['count'].astype(str).to_numpy())
+    table['color'] = 'black'
+    table['intensity'] = None
+    table['shape'] = shape
+    table['size'] = 0.7
+    table['obj_group'] = np.where(multiple, 'out ' + pair, 'out single ' + pair)
 
-                
-                if binding:
-                    bindings.append(binding)
+    return table, seq + len(table)
 
-            
-            inbindings[activity].extend(bindings)
 
-   
-    cnet_inbindings = {}
+def binding_chain_edges(out_nodes, in_nodes, activities, dep_dict):
 
+    if len(out_nodes) == 0 and len(in_nodes) == 0:
+        return pd.DataFrame()
 
-    for key, value in inbindings.items():
-        if key != 'start'and key!= 'end':
-            flattened_values = []
-            for sublist in value:
-                
-                if len(sublist) > 1 and len(set(sublist)) == 1:
-                    flattened_values.append((sublist[0],))
-                elif len(sublist) > 1 and len(set(sublist)) > 1:
-                    flattened_values.append(tuple(set(sublist)))
-                else:
-                    flattened_values.append(tuple(sublist))
-            
-            sorted_values = [tuple(sorted(sublist)) for sublist in flattened_values]
-            
-            bindings_counter = Counter(sorted_values)
-            
-            cnet_inbindings[key] = dict(bindings_counter)
+    arcs = pd.concat([out_nodes[['source', 'target']], in_nodes[['source', 'target']]], ignore_index=True)
+    arc_codes = arcs.groupby(['source', 'target'], sort=True).ngroup().to_numpy()
 
-    return cnet_inbindings
+    
+    o_nodes = out_nodes[['source', 'target', 'node', 'len_binding']].assign(arc=arc_codes[:len(out_nodes)])
+    o_nodes = o_nodes.iloc[np.lexsort((np.arange(len(o_nodes)), o_nodes['len_binding'].to_numpy(), o_nodes['arc'].to_numpy()))]
+    i_nodes = in_nodes[['source', 'target', 'node', 'len_binding']].assign(arc=arc_codes[len(out_nodes):])
+    i_nodes = i_nodes.iloc[np.lexsort((np.arange(len(i_nodes)), -i_nodes['len_binding'].to_numpy(), i_nodes['arc'].to_numpy()))]
+
+    
+    pieces = []
+    for nodes, relation in [(o_nodes, 'continue_o'), (i_nodes, 'continue_i')]:
+        grouped = nodes.groupby('arc', sort=False)
+        nodes = nodes.assign(rank=grouped.cumcount(), next_node=grouped['node'].shift(-1))
+        chain_nodes = nodes[nodes['next_node'].notna()]
+        pieces.append((nodes, chain_nodes.assign(edge_source=chain_nodes['node'], edge_target=chain_nodes['next_node'], object_relation=relation)))
+    (o_nodes, o_chain), (i_nodes, i_chain) = pieces
+
+    o_first = o_nodes[o_nodes['rank'] == 0]
+    o_last = o_nodes.drop_duplicates('arc', keep='last')
+    i_first = i_nodes[i_nodes['rank'] == 0]
+    i_last = i_nodes.drop_duplicates('arc', keep='last')
+
+    middle = o_last[['source', 'target', 'arc', 'node']].merge(i_first[['arc', 'node']], on='arc', suffixes=('', '_in'))
+    middle['label'] = [f"freq = {activities[source][target]} / dep = {dep_dict[source][target]:.2f}" for source, target in zip(middle['source'], middle['target'])]
+
+    stages = [
+        o_first.assign(edge_source=o_first['source'], edge_target=o_first['node'], object_relation='start', stage=0),
+        o_chain.assign(stage=1),
+        middle.assign(edge_source=middle['node'], edge_target=middle['node_in'], object_relation='middle', stage=2, rank=0),
+        i_chain.assign(stage=3),
+        i_last.assign(edge_source=i_last['node'], edge_target=i_last['target'], object_relation='end', stage=4),
+    ]
+    edges = pd.concat([stage[['source', 'target', 'arc', 'stage', 'rank', 'edge_source', 'edge_target', 'object_relation'] + (['label'] if 'label' in stage else [])] for stage in stages], ignore_index=True)
+    edges = edges.iloc[np.lexsort((edges['rank'].to_numpy(), edges['stage'].to_numpy(), edges['arc'].to_numpy()))]
+
+    middle_edge = (edges['stage'] == 2).to_numpy()
+    return pd.DataFrame({
+        'original_edge': (edges['source'] + ' ' + edges['target']).to_numpy(),
+        'source': edges['edge_source'].to_numpy(),
+        'target': edges['edge_target'].to_numpy(),
+        'label': np.where(middle_edge, edges['label'].to_numpy(), ''),
+        'type': 'visualization',
+        'color': 'black',
+        'intensity': None,
+        'width': None,
+        'length': np.where(middle_edge, 4, 1),
+        'object_relation': edges['object_relation'].to_numpy(),
+        'arrow': (edges['stage'] == 4).to_numpy()
+    })
+
+
+def binding_pair_edges(binding_nodes, anchor, relation):
+
+    nodes = binding_nodes[binding_nodes['len_binding'] > 1][[anchor, 'binding', 'len_binding', 'node', 'count']]
+    nodes = nodes.assign(group=nodes.groupby([anchor, 'binding', 'len_binding'], sort=True).ngroup())
+    nodes = nodes.assign(rank=nodes.groupby('group').cumcount())
+
+    pairs = nodes[['group', 'rank', 'node', 'count']].merge(nodes[['group', 'rank', 'node']], on='group', suffixes=('', '_other'))
+    pairs = pairs[pairs['rank'] < pairs['rank_other']]
+    pairs = pairs.iloc[np.lexsort((pairs['rank_other'].to_numpy(), pairs['rank'].to_numpy(), pairs['group'].to_numpy()))]
+
+    return pd.DataFrame({
+        'original_edge': None,
+        'source': pairs['node'].to_numpy(),
+        'target': pairs['node_other'].to_numpy(),
+        'label': pairs['count'].to_numpy(),
+        'type': 'vis_binding',
+        'color': 'black',
+        'intensity': None,
+        'width': None,
+        'object_relation': relation
+    })
 
 
 def ot_graph(graph, act_total, total_activities, ot_counts, mean_dict, median_dict, min_dict, max_dict, activities, dep_dict, cnet_inbindings, cnet_outbindings, seq_i, seq_o):
@@ -798,309 +1892,273 @@ def ot_graph(graph, act_total, total_activities, ot_counts, mean_dict, median_di
     nodes_df = nodes_df.assign(**new_columns)
 
     
-    edges_filtered = [edge for edge in graph.edges if 'start' not in edge and 'end' not in edge]
-    
-    col_len = 3
-    normalized_edges = [tuple((list(edge_tuple) + [None] * (col_len - len(edge_tuple)))) for edge_tuple in edges_filtered]
+    out_nodes, seq_o = binding_node_table(cnet_outbindings, seq_o, outgoing=True)
+    in_nodes, seq_i = binding_node_table(cnet_inbindings, seq_i, outgoing=False)
 
-    edges_df = pd.DataFrame(normalized_edges, columns=['source','target', 'long_distance_dep'])
     
-    edges_df['frequency'] = edges_df.apply(lambda row: activities.get(row['source'], {}).get(row['target'], np.nan), axis=1).astype(str)
-    edges_df['dependency'] = edges_df.apply(lambda row: '{:.2f}'.format(round(dep_dict.get(row['source'], {}).get(row['target'], np.nan), 2)), axis=1)
-    edges_df['label'] = f"freq = {edges_df['frequency']}/dep = {edges_df['dependency']}"
-    edges_df['type'] = 'dependency'
+    nodes_df = nodes_df[['node','type','source','target','binding','len_binding','label', 'tooltip', 'act_total','color','intensity','shape','size','obj_group']]
+    for table in [out_nodes, in_nodes]:
+        if len(table) > 0:
+            nodes_df = pd.concat([nodes_df, table.drop(columns='count')], ignore_index=True)
 
     
-    new_nodes = []
+    edge_tables = [
+        binding_chain_edges(out_nodes, in_nodes, activities, dep_dict),
+        binding_pair_edges(out_nodes, 'source', 'binding_o'),
+        binding_pair_edges(in_nodes, 'target', 'binding_i'),
+    ]
 
-    
-    seq_o = seq_o
+   
+    ldd = [edge for edge in graph.edges if len(edge) == 3 and 'start' not in edge and 'end' not in edge]
+    edge_tables.append(pd.DataFrame({
+        'original_edge': None,
+        'source': [edge[0] for edge in ldd],
+        'target': [edge[1] for edge in ldd],
+        'label': "",
+        'type': 'ldd_visualization',
+        'color': 'red',
+        'intensity': None,
+        'width': None,
+        'object_relation': 'ldd',
+        'arrow': True
+    }))
+
+    edge_tables = [table for table in edge_tables if len(table) > 0]
+    vis_edges = pd.concat(edge_tables, ignore_index=True) if edge_tables else pd.DataFrame()
+
+    nodes_df['len_binding'] = pd.to_numeric(nodes_df['len_binding'], errors='coerce')
+
+    return nodes_df, vis_edges, seq_i, seq_o
 
-    
-    for source, bindings in cnet_outbindings.items():
-        
-        for binding, label in bindings.items():
-            
-            if len(binding) > 1:
-                
-                for target in binding:
-                    
-                    new_nodes.append({
-                        'node': f"o_{seq_o}", 
-                        'label': None,
-                        'type': 'outbinding',
-                        'source': source,
-                        'target': target,
-                        'binding': binding,
-                        'len_binding': len(binding),
-                        'color': 'black',
-                        'intensity': None,
-                        'shape': 'point',
-                        'size': 0.7,
-                        'obj_group': f'out {source} - {target}'
-                    })
-
-                    seq_o += 1
 
+class DiscoveryCache:
+
+    def __init__(self, directory=None, max_memory=256 * 2**20, max_disk=4 * 2**30, max_age=7 * 24 * 3600):
+        self.directory = pathlib.Path(directory) if directory is not None else None
+        self.max_memory = max_memory
+        self.max_disk = max_disk
+        self.max_age = max_age
+        self.memory = OrderedDict()
+        self.memory_size = 0
+
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+    def entry_name(self, key):
+        return hashlib.sha256(repr(key).encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        name = self.entry_name(key)
+        now = time.time()
+
+        if name in self.memory:
+            stored_at, payload = self.memory[name]
+            if self.max_age is None or now - stored_at <= self.max_age:
+                self.memory.move_to_end(name)
+                return True, pickle.loads(payload)
+            self.memory_size -= len(payload)
+            del self.memory[name]
+
+        if self.directory is not None:
+            entry_path = self.directory / (name + '.pkl')
+            try:
+                if self.max_age is None or now - entry_path.stat().st_mtime <= self.max_age:
+                    payload = entry_path.read_bytes()
+                    os.utime(entry_path)
+                    self.remember(name, payload)
+                    return True, pickle.loads(payload)
+            except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+                pass
+
+        return False, None
+
+    def put(self, key, value):
+        name = self.entry_name(key)
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+        self.remember(name, payload)
+
+        if self.directory is not None and len(payload) <= self.max_disk:
+            entry_path = self.directory / (name + '.pkl')
+            partial_path = self.directory / (name + '.%d.tmp' % os.getpid())
+            partial_path.write_bytes(payload)
+            os.replace(partial_path, entry_path)
+            self.evict_disk()
+
+    def remember(self, name, payload):
+        if name in self.memory:
+            self.memory_size -= len(self.memory.pop(name)[1])
+
+        if len(payload) > self.max_memory:
+            return
+
+        self.memory[name] = (time.time(), payload)
+        self.memory_size += len(payload)
+
+        while self.memory_size > self.max_memory:
+            _, (_, evicted) = self.memory.popitem(last=False)
+            self.memory_size -= len(evicted)
+
+    def evict_disk(self):
+        now = time.time()
+        entries = []
+
+        for entry_path in self.directory.glob('*.pkl'):
+            try:
+                entry_stat = entry_path.stat()
+            except OSError:
+                continue
+            if self.max_age is not None and now - entry_stat.st_mtime > self.max_age:
+                entry_path.unlink(missing_ok=True)
             else:
-                
-                target = binding[0]
-                
-                new_nodes.append({
-                    'node': f"o_{seq_o}",
-                    'label': str(label),
-                    'type': 'outbinding',
-                    'source': source,
-                    'target': target,
-                    'binding': binding,
-                    'len_binding': len(binding),
-                    'color': 'black',
-                    'intensity': None,
-                    'shape': 'point',
-                    'size': 0.7,
-                    'obj_group': f'out single {source} - {target}'
-                })
-                seq_o += 1       
+                entries.append((entry_stat.st_mtime, entry_stat.st_size, entry_path))
 
-    
-    seq_o = seq_o
+        disk_size = sum(size for _, size, _ in entries)
 
-   
-    new_nodes_df = pd.DataFrame(new_nodes)
-    nodes_df = nodes_df._append(new_nodes_df, ignore_index=True)
-    nodes_df = nodes_df[['node','type','source','target','binding','len_binding','label', 'tooltip', 'act_total','color','intensity','shape','size','obj_group']]
+        for _, size, entry_path in sorted(entries):
+            if disk_size <= self.max_disk:
+                break
+            entry_path.unlink(missing_ok=True)
+            disk_size -= size
 
+    def fetch(self, key, compute):
+        found, value = self.get(key)
+        if not found:
+            value = compute()
+            self.put(key, value)
+        return value
 
-    
-    new_inbinding_nodes = []  
+    def disk_only(self):
+        if self.directory is None:
+            return None
+        return DiscoveryCache(self.directory, max_memory=0, max_disk=self.max_disk, max_age=self.max_age)
 
-    
-    seq_i = seq_i
 
-    
-    for target, inbindings in cnet_inbindings.items():
-        
-        for inbinding, label in inbindings.items():
-            
-            if len(inbinding) > 1:
-                
-                for source in inbinding:
-                    
-                    new_inbinding_nodes.append({
-                        'node': f"i_{seq_i}", 
-                        'type': 'inbinding',
-                        'source': source,
-                        'target': target,
-                        'binding': inbinding,
-                        'len_binding': len(inbinding),
-                        'label': None,
-                        'color': 'black',
-                        'intensity': None,
-                        'shape': 'diamond',
-                        'size': 0.7,
-                        'obj_group': f'out {target} - {source}'
-                    })
-
-                    seq_i += 1
 
-            else:
-                
-                source = inbinding[0]
-                
-                new_inbinding_nodes.append({
-                    'node': f"i_{seq_i}",
-                    'type': 'inbinding',
-                    'source': source,
-                    'target': target,
-                    'binding': inbinding,
-                    'len_binding': len(inbinding),
-                    'label': str(label),
-                    'color': 'black',
-                    'intensity': None,
-                    'shape': 'diamond',
-                    'size': 0.7,
-                    'obj_group': f'out single {target} - {source}'
-                })
-                seq_i += 1       
+fingerprints = {}
 
-    
-    seq_i = seq_i
 
-    
-    new_inbinding_nodes_df = pd.DataFrame(new_inbinding_nodes)
-    nodes_df = nodes_df._append(new_inbinding_nodes_df, ignore_index=True)
+def log_fingerprint(path, chunk_size=2**20):
 
-    vis_edges = pd.DataFrame(columns=['original_edge', 'source', 'target', 'label', 'type', 'color', 'intensity', 'width', 'length', 'object_relation', 'arrow']) 
+    if os.path.isdir(path):
+        path = os.path.join(path, 'vocabularies.json')
 
-   
-    intermediary_nodes = nodes_df[(nodes_df['node'].str.startswith('o_') | nodes_df['node'].str.startswith('i_'))]
+    file_stat = os.stat(path)
+    file_id = (os.path.abspath(path), file_stat.st_size, file_stat.st_mtime_ns)
 
-    
-    intermediary_nodes_grouped = intermediary_nodes.groupby(['source', 'target'])
+    if file_id not in fingerprints:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as log_file:
+            for chunk in iter(lambda: log_file.read(chunk_size), b''):
+                digest.update(chunk)
+        fingerprints[file_id] = digest.hexdigest()
 
-    edges_data = []
+    return fingerprints[file_id]
 
-   
-    for (source, target), group in intermediary_nodes_grouped:
-       
-        o_nodes = group[group['node'].str.startswith('o_')].sort_values(by='len_binding')
-        i_nodes = group[group['node'].str.startswith('i_')].sort_values(by='len_binding', ascending=False)
-        
-       
-        edges_data.append({'original_edge': f"{source} {target}", 'source': source, 'target': o_nodes.iloc[0]['node'], 'label': '', 'type': 'visualization', 'color': 'black', 'intensity': None, 'width': None, 'length': 1, 'object_relation': 'start', 'arrow': False})
-       
-        for i in range(len(o_nodes) - 1):
-            edges_data.append({'original_edge': f"{source} {target}", 'source': o_nodes.iloc[i]['node'], 'target': o_nodes.iloc[i+1]['node'], 'label': '', 'type': 'visualization', 'color': 'black', 'intensity': None, 'width': None, 'length': 1, 'object_relation': 'continue_o', 'arrow': False})
-        
-       
-        label_edge = f"freq = {activities[source][target]} / dep = {dep_dict[source][target]:.2f}"
-        edges_data.append({'original_edge': f"{source} {target}", 'source': o_nodes.iloc[-1]['node'], 'target': i_nodes.iloc[0]['node'], 'label':label_edge, 'type': 'visualization', 'color': 'black', 'intensity': None, 'width': None, 'length': 4, 'object_relation': 'middle', 'arrow': False})
-        
-        
-        for i in range(len(i_nodes) - 1):
-            edges_data.append({'original_edge': f"{source} {target}", 'source': i_nodes.iloc[i]['node'], 'target': i_nodes.iloc[i+1]['node'], 'label': '', 'type': 'visualization', 'color': 'black', 'intensity': None, 'width': None, 'length': 1, 'object_relation': 'continue_i', 'arrow': False})
-        
-        
-        edges_data.append({'original_edge': f"{source} {target}", 'source': i_nodes.iloc[-1]['node'], 'target': target, 'label': '', 'type': 'visualization', 'color': 'black', 'intensity': None, 'width': None, 'length': 1, 'object_relation': 'end', 'arrow': True})
 
 
-    vis_edges = pd.DataFrame(edges_data)
+def cached_stage(cache, key, compute):
 
+    if cache is None:
+        return compute()
 
-    additional_edges = []
+    return cache.fetch(key, compute)
 
-    nodes_df['len_binding'] = pd.to_numeric(nodes_df['len_binding'], errors='coerce')
 
-    filtered_nodes_df = nodes_df[nodes_df['len_binding'] > 1]
 
-    grouped_o_nodes = filtered_nodes_df[filtered_nodes_df['node'].str.startswith('o_')].groupby(['source', 'binding', 'len_binding'])
+def object_type_artefacts(store, cache=None, cache_key=None):
+
+    stats = cached_stage(cache, (cache_key, 'statistics'), lambda: trace_statistics(store))
+
+    freq = cached_stage(cache, (cache_key, 'frequencies'), lambda: frequency_matrix(store))
+    activities = frequency_dict(freq)
+
+    dep = cached_stage(cache, (cache_key, 'dependencies'), lambda: dependency_matrix(freq))
+
+    dep_dict = dependency_dict(dep)
+
+    long = cached_stage(cache, (cache_key, 'long_distance'), lambda: long_distance_dependency(stats.act_total, store, stats.original_start, stats.original_end))
+
+    return OTArtefacts(stats, freq, activities, dep, dep_dict, long)
+
+
 
+def discover_from_artefacts(store, artefacts, dependency_threshold, cache=None, cache_key=None, binding_processes=None):
+
+    stats = artefacts.statistics
+    act_total = stats.act_total
     
-    for group_key, group in grouped_o_nodes:
-        source, binding, len_binding = group_key
-        if group.shape[0] > 1:
-            
-            o_nodes_comb = list(combinations(group['node'], 2))
-            
-            for node1, node2 in o_nodes_comb:
-                binding_tuple = binding
-                
-                label = cnet_outbindings.get(source, {}).get(binding_tuple, None)
-                if label is not None:
-                   
-                    additional_edges.append({
-                        'original_edge': None,
-                        'source': node1,
-                        'target': node2,
-                        'label': label,
-                        'type': 'vis_binding',
-                        'color': 'black',
-                        'intensity': None,
-                        'width': None,
-                        'object_relation': 'binding_o'
-                    })
+    depgraph = cached_stage(cache, (cache_key, 'dependency_graph', dependency_threshold), lambda: dependency_graph(act_total, stats.original_start, stats.original_end, artefacts.frequencies, artefacts.dependencies, artefacts.dep_dict, artefacts.long_distance, dependency_threshold))
 
     
-    grouped_i_nodes = filtered_nodes_df[filtered_nodes_df['node'].str.startswith('i_')].groupby(['target', 'binding', 'len_binding'])
+    in_arcs = input_arcs(depgraph)
+    out_arcs = output_arcs(depgraph)
 
     
-    for (target, binding, len_binding), group in grouped_i_nodes:
-        if group.shape[0] > 1:
-           
-            i_nodes_comb = list(combinations(group['node'], 2))
-            
-            for node1, node2 in i_nodes_comb:
-                binding_tuple = binding
-                
-                label = cnet_inbindings.get(target, {}).get(binding_tuple, None)
-                if label is not None:
-                    
-                    additional_edges.append({
-                        'original_edge': None,
-                        'source': node1,
-                        'target': node2,
-                        'label': label,
-                        'type': 'vis_binding',
-                        'color': 'black',
-                        'intensity': None,
-                        'width': None,
-                        'object_relation': 'binding_i'
-                    })
+    def mine_bindings():
+        if binding_processes is not None and binding_processes > 1:
+            return sharded_bindings(store, out_arcs, in_arcs, binding_processes)
+        return output_bindings(store, out_arcs, in_arcs), input_bindings(store, out_arcs, in_arcs)
 
-   
-    additional_vis_edges = pd.DataFrame(additional_edges)
+    cnet_outbindings, cnet_inbindings = cached_stage(cache, (cache_key, 'bindings', dependency_threshold), mine_bindings)
 
-   
-    ldd = []
-
-    for index, row in edges_df.iterrows():
-        if row['long_distance_dep'] != None:
-            ldd.append({
-                        'original_edge': None,
-                        'source': row['source'],
-                        'target': row['target'],
-                        'label': "",
-                        'type': 'ldd_visualization',
-                        'color': 'red',
-                        'intensity': None,
-                        'width': None,
-                        'object_relation': 'ldd',
-                        'arrow': True
-                    })
-
-    ldd_edges = pd.DataFrame(ldd)
+    return OTDiscovery(act_total, artefacts.activities, artefacts.dep_dict, depgraph, cnet_inbindings, cnet_outbindings)
 
-    
-    vis_edges = pd.concat([vis_edges, additional_vis_edges, ldd_edges], ignore_index=True)
 
-    return nodes_df, vis_edges, seq_i, seq_o
 
+def discover_thresholds(store, dependency_thresholds, cache=None, cache_key=None, binding_processes=None):
 
-def subgraphs_dict(path, dependency_threshold):
-    
-    ocel, ot_activities, event_to_obj, obj_to_obj = import_log(path)
-    flt = flatten_log(ocel, ot_activities)
-    logs = read_log(flt)
+    store = compress_variants(store)
+    artefacts = object_type_artefacts(store, cache, cache_key)
 
-    all_traces = traces(flt)
+    return [discover_from_artefacts(store, artefacts, dependency_threshold, cache, cache_key, binding_processes) for dependency_threshold in dependency_thresholds]
 
-    activity_counts, ot_counts, mean_dict, median_dict, min_dict, max_dict = ot_act_stats(event_to_obj)
 
-    ot_subgraphs_dict = {}
 
-    
-    seq_i = 1
-    seq_o = 1
+def discover_object_type(store, dependency_threshold, cache=None, cache_key=None, binding_processes=None):
 
-    for obj_type in all_traces:
-        ot_traces = all_traces[obj_type]
+    return discover_thresholds(store, [dependency_threshold], cache, cache_key, binding_processes)[0]
 
-        act_total = activity_total(logs[obj_type])
-        activities = activity_frequencies(logs[obj_type])
-        or_start = original_start(act_total, activities)
-        or_end = original_end(act_total, activities)
 
-        freq = frequencies(activities)
 
-        dep = dependency_matrix(freq)
+def load_traces(path, cache=None, reader=None):
 
-        dep_dict = dependency_dict(dep)
+    if reader not in [None, 'pm4py']:
+        raise Exception("The readers supported are the columnar reader (None) and pm4py.")
 
-        long = long_distance_dependency(act_total, ot_traces, or_start, or_end)
-        
-        depgraph = dependency_graph(act_total, or_start, or_end, freq, dep, dep_dict, long, dependency_threshold)
+    def read_traces():
+        if reader == 'pm4py':
+            ocel, ot_activities, event_to_obj, obj_to_obj = import_log(path)
+            flt = flatten_relations(event_to_obj if ocel is None else flattening_order(ocel), ot_activities)
+            return ot_activities, trace_stores(flt), ot_act_stats(event_to_obj)
+        if pathlib.Path(path).is_dir():
+            return snapshot_traces(read_snapshot(path))
+        if pathlib.Path(path).suffix in ['.json', '.xml']:
+            return stream_traces(stream_ocel(path))
+        if pathlib.Path(path).suffix == '.sqlite':
+            return sqlite_traces(path)
+        raise Exception("The file formats supported are sqlite, json, and xml.")
 
-        
-        in_arcs = input_arcs(depgraph)
-        out_arcs = output_arcs(depgraph)
+    if cache is None:
+        return read_traces()
 
-        
-        cnet_outbindings = output_bindings(ot_traces, out_arcs, in_arcs)
-        cnet_inbindings = input_bindings(ot_traces, out_arcs, in_arcs) 
+    return cache.fetch((log_fingerprint(path), 'traces', reader), read_traces)
 
+
+
+def assemble_subgraphs(stores, discoveries, ot_stats, dependency_threshold, cache=None, cache_keys=None):
+
+    activity_counts, ot_counts, mean_dict, median_dict, min_dict, max_dict = ot_stats
+
+    ot_subgraphs_dict = {}
+
+    
+    seq_i = 1
+    seq_o = 1
+
+    for obj_type, discovery, cache_key in zip(stores.keys(), discoveries, cache_keys):
         
-        
-        ot_nodes, ot_edges, i_seq, o_seq = ot_graph(depgraph, act_total, activity_counts, ot_counts, mean_dict, median_dict, min_dict, max_dict, activities, dep_dict, cnet_inbindings, cnet_outbindings, seq_i, seq_o)
+        ot_nodes, ot_edges, i_seq, o_seq = cached_stage(cache, (cache_key, 'ot_graph', dependency_threshold, seq_i, seq_o), lambda: ot_graph(discovery.depgraph, discovery.act_total, activity_counts, ot_counts, mean_dict, median_dict, min_dict, max_dict, discovery.activities, discovery.dep_dict, discovery.cnet_inbindings, discovery.cnet_outbindings, seq_i, seq_o))
 
         ot_edges["object_type"] = obj_type
 
@@ -1111,4 +2169,307 @@ def subgraphs_dict(path, dependency_threshold):
         seq_i = i_seq
         seq_o = o_seq
 
-    return ot_activities, ot_subgraphs_dict
\ No newline at end of file
+    return ot_subgraphs_dict
+
+
+
+def threshold_sweep(path, dependency_thresholds, processes=None, cache=None, binding_processes=None, reader=None):
+
+    dependency_thresholds = list(dict.fromkeys(dependency_thresholds))
+    
+    ot_activities, stores, ot_stats = load_traces(path, cache, reader)
+
+    fingerprint = log_fingerprint(path) if cache is not None else None
+    cache_keys = [(fingerprint, obj_type) for obj_type in stores]
+
+    if processes is None or processes == 1 or len(stores) < 2:
+        discoveries = [discover_thresholds(store, dependency_thresholds, cache, cache_key, binding_processes) for store, cache_key in zip(stores.values(), cache_keys)]
+    else:
+        worker_cache = cache.disk_only() if cache is not None else None
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            discoveries = list(executor.map(discover_thresholds, stores.values(), [dependency_thresholds] * len(stores), [worker_cache] * len(stores), cache_keys, [binding_processes] * len(stores)))
+
+    models = {}
+
+    for i, dependency_threshold in enumerate(dependency_thresholds):
+        threshold_discoveries = [ot_discoveries[i] for ot_discoveries in discoveries]
+        models[dependency_threshold] = (ot_activities, assemble_subgraphs(stores, threshold_discoveries, ot_stats, dependency_threshold, cache, cache_keys))
+
+    return models
+
+
+
+def subgraphs_dict(path, dependency_threshold, processes=None, cache=None, binding_processes=None, reader=None):
+
+    return threshold_sweep(path, [dependency_threshold], processes, cache, binding_processes, reader)[dependency_threshold]
+
+
+
+def variant_bindings(variants, out_arcs, in_arcs):
+
+    store = trace_store({i: list(variant) for i, variant in enumerate(variants)})._replace(weights=np.array(list(variants.values()), dtype=np.int64))
+
+    outbindings = {key: Counter(bindings) for key, bindings in output_bindings(store, out_arcs, in_arcs).items()}
+    inbindings = {key: Counter(bindings) for key, bindings in input_bindings(store, out_arcs, in_arcs).items()}
+
+    return outbindings, inbindings
+
+
+
+class TraceCounts:
+
+    def __init__(self):
+        self.activities = []
+        self.vocabulary = {}
+        self.totals = np.zeros(0, dtype=np.int64)
+        self.starts = np.zeros(0, dtype=np.int64)
+        self.ends = np.zeros(0, dtype=np.int64)
+        self.follows = np.zeros((0, 0), dtype=np.int64)
+        self.between = np.zeros((0, 0), dtype=np.int64)
+        self.target_position = np.zeros(0, dtype=np.int64)
+        self.targets = []
+        self.avoid = np.zeros((0, 0, 0), dtype=np.uint8)
+        self.variants = Counter()
+
+    def codes(self, activities):
+
+        for activity in activities:
+            if activity not in self.vocabulary:
+                self.vocabulary[activity] = len(self.activities)
+                self.activities.append(activity)
+
+        n_activities = len(self.activities)
+        grow = n_activities - len(self.totals)
+
+        if grow > 0:
+            self.totals = np.pad(self.totals, (0, grow))
+            self.starts = np.pad(self.starts, (0, grow))
+            self.ends = np.pad(self.ends, (0, grow))
+            self.follows = np.pad(self.follows, ((0, grow), (0, grow)))
+            self.between = np.pad(self.between, ((0, grow), (0, grow)))
+
+        if n_activities > len(self.target_position):
+            self.reserve(max(2 * len(self.target_position), n_activities), self.avoid.shape[1])
+
+        return np.array([self.vocabulary[activity] for activity in activities], dtype=np.int64)
+
+    def reserve(self, activity_capacity, target_capacity):
+
+        activity_capacity = (activity_capacity + 7) // 8 * 8
+        avoid = np.zeros((activity_capacity, target_capacity, activity_capacity // 8), dtype=np.uint8)
+        n_rows, n_targets, n_bytes = self.avoid.shape
+        avoid[:n_rows, :n_targets, :n_bytes] = self.avoid
+
+        if n_bytes < activity_capacity // 8 and self.targets:
+            target_codes = np.array(self.targets, dtype=np.int64)
+            observed = np.diagonal(avoided_paths(self.reachability(), np.arange(n_rows), target_codes, target_codes), axis1=1, axis2=2)
+            avoid[:n_rows, :len(self.targets), n_bytes:] = np.where(observed, 0xFF, 0).astype(np.uint8)[:, :, None]
+
+        self.avoid = avoid
+        self.target_position = np.pad(self.target_position, (0, activity_capacity - len(self.target_position)), constant_values=-1)
+
+    def add_targets(self, activities):
+
+        codes = [code for code in self.codes(activities) if self.target_position[code] < 0]
+        if len(self.targets) + len(codes) > self.avoid.shape[1]:
+            self.reserve(len(self.target_position), max(2 * self.avoid.shape[1], len(self.targets) + len(codes)))
+
+        for code in codes:
+            self.target_position[code] = len(self.targets)
+            self.targets.append(code)
+
+    def reachability(self):
+        return ReachabilityIndex(self.activities, self.vocabulary, self.target_position, self.avoid)
+
+    def add(self, ot_traces):
+
+        ot_traces = {caseID: trace for caseID, trace in ot_traces.items() if len(trace) > 0}
+        if not ot_traces:
+            return
+
+        store = compress_variants(trace_store(ot_traces))
+        stats = trace_statistics(store)
+
+        unseen = [activity for activity in store.activities if activity not in self.vocabulary]
+        codes = self.codes(store.activities)
+        self.add_targets([activity for activity in unseen if stats.end_activities.get(activity, 0) == stats.act_total[activity]])
+
+        self.totals[codes] += [stats.act_total[activity] for activity in store.activities]
+        self.starts[codes] += [stats.start_activities.get(activity, 0) for activity in store.activities]
+        self.ends[codes] += [stats.end_activities.get(activity, 0) for activity in store.activities]
+
+        freq = frequency_matrix(store)
+        freq_codes = self.codes(freq.index)
+        self.follows[np.ix_(freq_codes, freq_codes)] += freq.to_numpy(dtype=np.int64)
+
+        self.between[np.ix_(codes, codes)] += between_counts(store).to_numpy()
+
+        new_variants = {i: list(variant) for i, variant in enumerate({tuple(trace) for trace in ot_traces.values()} - set(self.variants))}
+        if new_variants:
+            variant_store = trace_store(new_variants)
+            variant_codes = self.codes(variant_store.activities)
+            local_targets = np.flatnonzero(self.target_position[variant_codes] >= 0)
+            if len(local_targets) > 0:
+                index = reachability_index(variant_store, targets=local_targets)
+                local_codes = np.arange(len(variant_codes))
+                found = avoided_paths(index, local_codes, local_targets, local_codes)
+                observed = np.diagonal(avoided_paths(index, local_codes, local_targets, local_targets), axis1=1, axis2=2)
+                avoided = np.repeat(observed[:, :, None], len(self.target_position), axis=2)
+                avoided[:, :, variant_codes] = found
+                self.avoid[np.ix_(variant_codes, self.target_position[variant_codes[local_targets]])] |= np.packbits(avoided, axis=2)
+
+        self.variants.update(tuple(trace) for trace in ot_traces.values())
+
+    def combined(self, other):
+
+        counts = TraceCounts()
+        counts.activities = list(self.activities)
+        counts.vocabulary = dict(self.vocabulary)
+
+        for activity in other.activities:
+            if activity not in counts.vocabulary:
+                counts.vocabulary[activity] = len(counts.activities)
+                counts.activities.append(activity)
+
+        grow = len(counts.activities) - len(self.activities)
+        other_codes = np.array([counts.vocabulary[activity] for activity in other.activities], dtype=np.int64)
+
+        for name in ['totals', 'starts', 'ends']:
+            values = np.pad(getattr(self, name), (0, grow))
+            values[other_codes] += getattr(other, name)
+            setattr(counts, name, values)
+
+        for name in ['follows', 'between']:
+            values = np.pad(getattr(self, name), ((0, grow), (0, grow)))
+            values[np.ix_(other_codes, other_codes)] += getattr(other, name)
+            setattr(counts, name, values)
+
+        return counts
+
+    def statistics(self):
+
+        act_total = dict(zip(self.activities, self.totals.tolist()))
+        start_activities = {self.activities[code]: self.starts[code].item() for code in np.flatnonzero(self.starts)}
+        end_activities = {self.activities[code]: self.ends[code].item() for code in np.flatnonzero(self.ends)}
+
+        original_start = [self.activities[code] for code in np.flatnonzero((self.totals > 0) & (self.starts == self.totals))]
+        original_end = [self.activities[code] for code in np.flatnonzero((self.totals > 0) & (self.ends == self.totals))]
+
+        return TraceStatistics(act_total, start_activities, end_activities, original_start, original_end)
+
+    def frequencies(self):
+
+        observed = np.flatnonzero(self.follows.any(axis=1) | self.follows.any(axis=0))
+        labels = [self.activities[code] for code in observed]
+
+        return pd.DataFrame(self.follows[np.ix_(observed, observed)], index=labels, columns=labels)
+
+    def artefacts(self, open_counts=None):
+
+        counts = self if open_counts is None else self.combined(open_counts)
+        indexes = [self.reachability()] if open_counts is None else [self.reachability(), open_counts.reachability()]
+
+        stats = counts.statistics()
+        freq = counts.frequencies()
+        dep = dependency_matrix(freq)
+        long_counts = LongDistanceCounts(counts.activities, counts.vocabulary, counts.totals, counts.between, indexes)
+        long = long_distance_dependency(stats.act_total, long_counts, stats.original_start, stats.original_end)
+
+        return OTArtefacts(stats, freq, frequency_dict(freq), dep, dependency_dict(dep), long)
+
+
+
+class IncrementalDiscovery:
+
+    def __init__(self):
+        self.ot_activities = {}
+        self.total_act = Counter()
+        self.histogram = Counter()
+        self.boundary = pd.DataFrame(columns=['ocel:eid', 'ocel:activity', 'ocel:type'])
+        self.open_cases = {}
+        self.closed_objects = set()
+        self.closed = {}
+        self.pending = {}
+        self.arcs = {}
+        self.outbindings = {}
+        self.inbindings = {}
+
+    def update(self, event_to_obj, closed_objects=()):
+
+        reopened = set(event_to_obj['ocel:oid']) & self.closed_objects
+        if reopened:
+            raise Exception("Events were added to closed objects: " + ", ".join(sorted(map(str, reopened))))
+
+        for obj_type, activities in event_to_obj.groupby('ocel:type', sort=False)['ocel:activity']:
+            self.ot_activities.setdefault(obj_type, set()).update(activities)
+
+        batch = event_to_obj[['ocel:eid', 'ocel:activity', 'ocel:type']]
+        carried = self.boundary[self.boundary['ocel:eid'].isin(batch['ocel:eid'])]
+        if len(carried):
+            total_act, histogram = relation_histogram(carried)
+            self.total_act -= total_act
+            self.histogram -= histogram
+            batch = pd.concat([carried, batch], ignore_index=True)
+        self.boundary = batch
+
+        total_act, histogram = relation_histogram(batch)
+        self.total_act.update(total_act)
+        self.histogram.update(histogram)
+
+        for obj_type, flt in flatten_relations(event_to_obj, self.ot_activities).items():
+            cases, starts, ends, events = frame_cases(flt)
+            open_cases = self.open_cases.setdefault(obj_type, {})
+            for caseID, start, end in zip(cases, starts, ends):
+                case = open_cases.setdefault(caseID, [])
+                case.extend((timestamp, task) for task, _, timestamp in events[start:end])
+                case.sort(key = lambda event: event[0])
+
+        closed_objects = set(closed_objects)
+
+        for obj_type, open_cases in self.open_cases.items():
+            closing = {caseID: [task for _, task in open_cases.pop(caseID)] for caseID in closed_objects & open_cases.keys()}
+            if closing:
+                self.closed.setdefault(obj_type, TraceCounts()).add(closing)
+                self.pending.setdefault(obj_type, Counter()).update(tuple(trace) for trace in closing.values())
+
+        self.closed_objects |= closed_objects
+
+    def discover_object_type(self, obj_type, dependency_threshold):
+
+        closed = self.closed.get(obj_type, TraceCounts())
+        open_traces = {caseID: [task for _, task in case] for caseID, case in self.open_cases.get(obj_type, {}).items()}
+
+        open_counts = TraceCounts()
+        open_counts.add(open_traces)
+
+        artefacts = closed.artefacts(open_counts)
+        depgraph = dependency_graph(artefacts.statistics.act_total, artefacts.statistics.original_start, artefacts.statistics.original_end, artefacts.frequencies, artefacts.dependencies, artefacts.dep_dict, artefacts.long_distance, dependency_threshold)
+
+        in_arcs = input_arcs(depgraph)
+        out_arcs = output_arcs(depgraph)
+
+        if self.arcs.get(obj_type) != (out_arcs, in_arcs):
+            self.arcs[obj_type] = (out_arcs, in_arcs)
+            self.pending[obj_type] = Counter(closed.variants)
+            self.outbindings[obj_type], self.inbindings[obj_type] = variant_bindings({}, out_arcs, in_arcs)
+
+        closed_out, closed_in = variant_bindings(self.pending.pop(obj_type, {}), out_arcs, in_arcs)
+        open_out, open_in = variant_bindings(Counter(tuple(trace) for trace in open_traces.values()), out_arcs, in_arcs)
+
+        for key in closed_out:
+            self.outbindings[obj_type][key].update(closed_out[key])
+        for key in closed_in:
+            self.inbindings[obj_type][key].update(closed_in[key])
+
+        cnet_outbindings = {key: dict(bindings + open_out[key]) for key, bindings in self.outbindings[obj_type].items()}
+        cnet_inbindings = {key: dict(bindings + open_in[key]) for key, bindings in self.inbindings[obj_type].items()}
+
+        return OTDiscovery(artefacts.statistics.act_total, artefacts.activities, artefacts.dep_dict, depgraph, cnet_inbindings, cnet_outbindings)
+
+    def refresh(self, dependency_threshold):
+
+        obj_types = {obj_type: None for obj_type in self.ot_activities if obj_type in self.open_cases}
+        discoveries = [self.discover_object_type(obj_type, dependency_threshold) for obj_type in obj_types]
+        ot_stats = histogram_act_stats(self.total_act, self.histogram)
+
+        return self.ot_activities, assemble_subgraphs(obj_types, discoveries, ot_stats, dependency_threshold, cache_keys=[None] * len(obj_types))
@@ -13,6 +13,69 @@ from pathlib import Path
 warnings.filterwarnings('ignore')
 
 
+def merge_cross_type_edges(all_ot_nodes_df, all_ot_edges_df):
+
+    edges = all_ot_edges_df.reset_index(drop=True)
+
+    
+    nodes_len1 = set(all_ot_nodes_df.loc[all_ot_nodes_df['len_binding'] == 1, 'node'])
+    activity_nodes = set(all_ot_nodes_df.loc[all_ot_nodes_df['type'] == 'activity', 'node'])
+
+    out_degree = edges['source'].map(edges['source'].value_counts())
+    in_degree = edges['target'].map(edges['target'].value_counts())
+
+    
+    middle = edges['source'].str.startswith('o_') & edges['target'].str.startswith('i_')
+    valid_sources = set(edges.loc[middle & (out_degree == 1), 'source']).intersection(nodes_len1)
+    valid_targets = set(edges.loc[middle & (in_degree == 1), 'target']).intersection(nodes_len1)
+
+    
+    edges1 = pd.DataFrame({'position1': edges.index, 'o_node': edges['target']})[edges['source'].isin(activity_nodes) & edges['target'].isin(valid_sources)]
+    edges2 = pd.DataFrame({'position2': edges.index, 'o_node': edges['source'], 'i_node': edges['target']})[edges['source'].isin(valid_sources) & edges['target'].isin(valid_targets)]
+    edges3 = pd.DataFrame({'position3': edges.index, 'i_node': edges['source']})[edges['source'].isin(valid_targets) & edges['target'].isin(activity_nodes)]
+
+    chains = edges1.merge(edges2, on='o_node').merge(edges3, on='i_node')
+    positions = chains[['position1', 'position2', 'position3']].to_numpy().ravel()
+
+    if len(positions) == 0:
+        return all_ot_nodes_df, all_ot_edges_df.reset_index(drop=True)
+
+    edges_to_merge = edges.iloc[positions].reset_index(drop=True).drop_duplicates()
+
+    
+    remaining_edges = pd.merge(all_ot_edges_df, edges_to_merge, indicator=True, how='outer').query('_merge=="left_only"').drop('_merge', axis=1)
+
+    
+    separator = '<BR ALIGN="LEFT"/>'
+    labels = edges_to_merge['label'].where(edges_to_merge['label'].notna(), '').astype(str).str.strip()
+    formatted_labels = ('<FONT COLOR="' + edges_to_merge['ot_color'] + '">' + labels + '</FONT>' + separator).where(labels != '', '')
+
+    joined_edges = edges_to_merge.assign(label=formatted_labels).groupby(['original_edge', 'object_relation']).agg({
+        'label': 'sum',
+        'obj_type': 'first',
+        'ot_color': 'first',
+        'type': 'first',
+        'source': 'first',
+        'target': 'first',
+        'width': 'first',
+        'color': 'first',
+        'intensity': 'first',
+        'arrow': 'first',
+        'length': 'first'
+    }).reset_index()
+    joined_edges['label'] = '<' + joined_edges['label'].str.removesuffix(separator) + '>'
+
+    
+    resulting_edges = pd.concat([joined_edges, remaining_edges]).reset_index(drop=True)
+
+    
+    nodes_to_merge = set(edges_to_merge['source']).union(set(edges_to_merge['target']))
+    resulting_nodes = set(resulting_edges['source']).union(set(resulting_edges['target']))
+    nodes_not_used = nodes_to_merge - resulting_nodes
+
+    return all_ot_nodes_df[~all_ot_nodes_df['node'].isin(nodes_not_used)], resulting_edges
+
+
 def all_ot_visualization(ot_activities, subgraphs_dict, profile=None):
   
     graph = graphviz.Digraph()
@@ -62,91 +125,7 @@ def all_ot_visualization(ot_activities, subgraphs_dict, profile=None):
     all_ot_edges_df = pd.concat(filtered_profile_edges)
 
     
-    filter_nodes_binding_len1 = all_ot_nodes_df[all_ot_nodes_df['len_binding'] == 1]
-    nodes_len1 = set(filter_nodes_binding_len1['node'])
-
-    
-    valid_sources = set(all_ot_edges_df[(all_ot_edges_df['source'].str.startswith('o_')) & (all_ot_edges_df['target'].str.startswith('i_'))]['source'])
-    valid_targets = set(all_ot_edges_df[(all_ot_edges_df['source'].str.startswith('o_')) & (all_ot_edges_df['target'].str.startswith('i_'))]['target'])
-    
-    
-    valid_sources = {source for source in valid_sources if all_ot_edges_df[all_ot_edges_df['source'] == source].shape[0] == 1}
-    valid_targets = {target for target in valid_targets if all_ot_edges_df[all_ot_edges_df['target'] == target].shape[0] == 1}
-
-    
-    activity_nodes = set(all_ot_nodes_df[all_ot_nodes_df['type'] == 'activity']['node'])
-
-    valid_sources = nodes_len1.intersection(valid_sources)
-    valid_targets = nodes_len1.intersection(valid_targets)
-
-    
-    edges1 = all_ot_edges_df[all_ot_edges_df.apply(lambda row: row['source'] in activity_nodes and row['target'] in valid_sources, axis=1)]
-    
-    edges2 = all_ot_edges_df[all_ot_edges_df.apply(lambda row: row['source'] in valid_sources and row['target'] in valid_targets, axis=1)]
-    
-    edges3 = all_ot_edges_df[all_ot_edges_df.apply(lambda row: row['source'] in valid_targets and row['target'] in activity_nodes, axis=1)]
-
-    
-    edges_to_merge = pd.DataFrame()
-
-   
-    for _, edge1 in edges1.iterrows():
-        source1, target1 = edge1['source'], edge1['target']
-
-        
-        middle_edges = edges2[edges2['source'] == target1]
-
-        for _, edge2 in middle_edges.iterrows():
-            target2 = edge2['target']
-
-            
-            final_edges = edges3[(edges3['source'] == target2) & (edges3['target'].isin(activity_nodes))]
-
-            for _, edge3 in final_edges.iterrows():
-                
-                edges_to_merge = pd.concat([edges_to_merge, pd.DataFrame([edge1]), pd.DataFrame([edge2]), pd.DataFrame([edge3])], ignore_index=True)
-
-    edges_to_merge = edges_to_merge.drop_duplicates()
-    
-    
-    remaining_edges = pd.merge(all_ot_edges_df,edges_to_merge, indicator=True, how='outer').query('_merge=="left_only"').drop('_merge', axis=1)
-    
-    def merge_labels(x):
-        labels = x.dropna()
-        colors = edges_to_merge.loc[labels.index, 'ot_color'].dropna()
-        
-        formatted_labels = [f'<FONT COLOR="{color}">{label.strip()}</FONT>' for label, color in zip(labels, colors) if label.strip()]
-        merged_label = '<BR ALIGN="LEFT"/>'.join(formatted_labels)
-        merged_label = f'<{merged_label}>'
-
-        return merged_label
-
-    joined_edges = edges_to_merge.groupby(['original_edge', 'object_relation']).agg({
-        'label': merge_labels,
-        'obj_type': 'first',
-        'ot_color': 'first',
-        'type': 'first',
-        'source': 'first',
-        'target': 'first',
-        'width': 'first',
-        'color': 'first',
-        'intensity': 'first',
-        'arrow': 'first',
-        'length': 'first'
-    }).reset_index()    
-
-    
-    resulting_edges = pd.concat([joined_edges, remaining_edges]).reset_index(drop=True)
-
-    nodes_of_joined_edges = set(joined_edges['source']).union(set(joined_edges['target']))
-
-    
-    nodes_to_merge = set(edges_to_merge['source']).union(set(edges_to_merge['target']))
-    
-    resulting_nodes = set(resulting_edges['source']).union(set(resulting_edges['target']))
-    nodes_not_used = nodes_to_merge - resulting_nodes
-
-    all_ot_nodes_df = all_ot_nodes_df[~all_ot_nodes_df['node'].isin(nodes_not_used)]
+    all_ot_nodes_df, resulting_edges = merge_cross_type_edges(all_ot_nodes_df, all_ot_edges_df)
 
     
     for _, row in all_ot_nodes_df.iterrows():